@@ -10,12 +10,79 @@ import time
 import random
 import html
 import codecs
+import bisect
+import itertools
+import orjson
 from bs4 import BeautifulSoup
+from collections import defaultdict
 from datetime import datetime
 from utils.scrapfly_config import ScrapFlyConfig
 from utils.instagram_auth import InstagramAuth
 from utils.logger import get_logger
 
+# Prefer lxml (libxml2) for HTML parsing; fall back to html.parser if it is missing
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Text cleanup patterns used by _clean_extracted_text
+_WHITESPACE_RE = re.compile(r'\s+')
+_UI_TEXT_RE = re.compile(
+    r'^(likes?|me gusta|comentarios?|comments?|compartir|share|seguir|follow)\s*'
+    r'|\s*(likes?|me gusta|comentarios?|comments?|compartir|share|seguir|follow)$',
+    re.IGNORECASE
+)
+
+# Caps on how many comments the direct-API fallback extractors return
+_COMMENT_HTML_LIMIT = 50
+_JSON_FALLBACK_LIMIT = 20
+
+# Keys whose object value holds GraphQL comment edges, most specific first
+_GRAPHQL_COMMENT_KEYS = ('"edge_media_to_parent_comment"', '"edge_media_to_comment"', '"comments"')
+
+# JSON strings (skipped whole) and brackets, for locating the end of an embedded object
+_JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+# Patterns used by the last-resort text/username pairing in _extract_from_json_fallback
+_TEXT_RE = re.compile(r'"text"\s*:\s*"([^"]{10,300})"')
+_USERNAME_CTX_RE = re.compile(r'"username":\s*"([^"]+)"')
+_LIKES_CTX_RE = re.compile(r'"(?:like_count|count)":\s*(\d+)')
+
+# How far (in characters) around a text match to look for its username/likes
+_CONTEXT_RADIUS = 500
+
+# UI keywords that disqualify a candidate comment; each extractor keeps its own list
+_HTML_SKIP_RE = re.compile(r'follow|like|share|view profile', re.IGNORECASE)
+_COMMENT_HTML_SKIP_RE = re.compile(r'follow|posts|view profile', re.IGNORECASE)
+_JSON_NODE_SKIP_RE = re.compile(r'loading|follow|profile|instagram|see original', re.IGNORECASE)
+_JSON_TEXT_SKIP_RE = re.compile(r'loading|follow|profile|instagram', re.IGNORECASE)
+
+# Follower count patterns for profile pages, one alternative per group.
+# Lower group numbers are more reliable and win over earlier matches of later groups.
+_FOLLOWER_RE = re.compile(
+    r'"edge_followed_by":\s*{\s*"count":\s*(\d+)'
+    r'|"follower_count":(\d+)'
+    r'|(\d+(?:,\d+)*)\s*followers'
+    r'|(\d+(?:\.\d+)?[KMB]?)\s*followers',
+    re.IGNORECASE
+)
+
+# Multipliers for abbreviated follower counts such as '1.2K'
+_SUFFIX_MULTIPLIERS = {
+    'K': 1_000, 'k': 1_000,
+    'M': 1_000_000, 'm': 1_000_000,
+    'B': 1_000_000_000, 'b': 1_000_000_000
+}
+
+# Thresholds (ascending) and suffixes used by _format_number
+_NUMBER_THRESHOLDS = (1_000, 1_000_000, 1_000_000_000)
+_NUMBER_SUFFIXES = ('K', 'M', 'B')
+
+# Seconds before a failed ('N/A') follower lookup is retried
+_FOLLOWER_MISS_TTL = 300
+
 class InstagramScraper:
     def __init__(self):
         self.logger = get_logger()
@@ -24,6 +91,9 @@ class InstagramScraper:
         self.auth = InstagramAuth(self.scrapfly.client)
         self.is_logged_in = False
         
+        # username -> (followers, fetched_at), shared across posts
+        self._follower_cache = {}
+        
         self.logger.info("Instagram scraper initialized")
         
         # Try to load existing session
@@ -111,16 +181,10 @@ class InstagramScraper:
         text = text.strip()
         
         # Remove multiple whitespaces but keep structure
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove common Instagram UI text that might get extracted
-        ui_patterns = [
-            r'^(likes?|me gusta|comentarios?|comments?|compartir|share|seguir|follow)\s*',
-            r'\s*(likes?|me gusta|comentarios?|comments?|compartir|share|seguir|follow)$'
-        ]
+        text = _WHITESPACE_RE.sub(' ', text)
         
-        for pattern in ui_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        # Remove common Instagram UI text that might get extracted (leading and trailing)
+        text = _UI_TEXT_RE.sub('', text)
         
         return text.strip()
     
@@ -190,7 +254,7 @@ class InstagramScraper:
             
             # Step 3: Extract comments using multiple strategies
             self.logger.debug("Step 3: Extracting comments")
-            comments = self._extract_real_comments(result['html'], url)
+            comments, unique_users = self._extract_real_comments(result['html'], url)
             
             # Log initial extraction results
             real_usernames = len([c for c in comments if not c.get('username', '').startswith('@user_')])
@@ -203,9 +267,9 @@ class InstagramScraper:
             })
             
             # Step 4: Enrich comments with follower data (if we have real users)
-            if comments and any(c.get('username', '').startswith('@') and 'user_' not in c.get('username', '') for c in comments):
+            if comments and unique_users:
                 self.logger.info(f"Step 4: Enriching {len(comments)} comments with follower data")
-                comments = self._enrich_with_followers(comments)
+                comments = self._enrich_with_followers(comments, unique_users)
             else:
                 self.logger.warning("Skipping follower enrichment - no real users found or not authenticated")
             
@@ -421,7 +485,7 @@ class InstagramScraper:
         metadata = {}
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, _HTML_PARSER)
             
             # Extract from JSON-LD
             scripts = soup.find_all('script', type='application/ld+json')
@@ -473,7 +537,13 @@ class InstagramScraper:
         return metadata
     
     def _extract_real_comments(self, html, url):
-        """Extract real comments from Instagram HTML"""
+        """
+        Extract real comments from Instagram HTML
+        
+        Returns:
+            tuple: (comments, unique_users) where unique_users maps each real
+                username to its comments, ready for _enrich_with_followers
+        """
         comments = []
         
         try:
@@ -495,16 +565,16 @@ class InstagramScraper:
             # Strategy 3: Use ScrapFly's direct API approach
             if len(comments) == 0:
                 self.logger.log_extraction_attempt("Direct API", url)
-                api_comments = self._extract_with_direct_api(url)
+                api_comments = self._extract_with_direct_api(url, self.limits['max_comments_per_video'])
                 comments.extend(api_comments)
                 self.logger.debug(f"Strategy 3 (API): Found {len(api_comments)} comments")
             
-            # Remove duplicates and limit results
+            # Remove duplicates, limit results and group by user in one pass
             self.logger.debug(f"Removing duplicates from {len(comments)} total comments")
-            unique_comments = self._remove_duplicate_comments(comments)
-            self.logger.debug(f"After deduplication: {len(unique_comments)} unique comments")
-            
-            final_comments = unique_comments[:self.limits['max_comments_per_video']]
+            final_comments, unique_users = self._dedup_and_group(
+                comments, self.limits['max_comments_per_video']
+            )
+            self.logger.debug(f"After deduplication: {len(final_comments)} unique comments")
             
             # Log individual comment details for debugging
             for comment in final_comments[:5]:  # Log first 5 for debugging
@@ -517,11 +587,11 @@ class InstagramScraper:
                 )
             
             self.logger.info(f"Comment extraction complete: {len(final_comments)} comments extracted")
-            return final_comments
+            return final_comments, unique_users
             
         except Exception as e:
             self.logger.error("Critical error in _extract_real_comments", {'error': str(e)}, exc_info=True)
-            return []
+            return [], {}
     
     def _extract_from_embedded_json(self, html):
         """Extract comments from embedded JSON data"""
@@ -558,8 +628,8 @@ class InstagramScraper:
         
         return comments
     
-    def _parse_comment_json(self, data):
-        """Parse comments from JSON data structure"""
+    def _parse_comment_json(self, data, limit=None):
+        """Parse comments from JSON data structure, stopping after limit comments if given"""
         comments = []
         
         try:
@@ -578,6 +648,8 @@ class InstagramScraper:
                         edges = edge_comments.get('edges', [])
                         
                         for i, edge in enumerate(edges):
+                            if limit and len(comments) >= limit:
+                                break
                             node = edge.get('node', {})
                             if node.get('text'):
                                 owner = node.get('owner', {})
@@ -609,6 +681,8 @@ class InstagramScraper:
             elif 'edges' in data:
                 edges = data['edges']
                 for i, edge in enumerate(edges):
+                    if limit and len(comments) >= limit:
+                        break
                     node = edge.get('node', {})
                     if node.get('text'):
                         owner = node.get('owner', {})
@@ -646,7 +720,7 @@ class InstagramScraper:
         comments = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, _HTML_PARSER)
             
             # Look for comment-like structures
             selectors = [
@@ -675,7 +749,7 @@ class InstagramScraper:
                         
                         # Skip if it doesn't look like a real comment
                         if (len(comment_text) > 3 and 
-                            not any(skip in comment_text.lower() for skip in ['follow', 'like', 'share', 'view profile'])):
+                            not _HTML_SKIP_RE.search(comment_text)):
                             
                             comment = {
                                 'comment_id': len(comments) + 1,
@@ -702,8 +776,17 @@ class InstagramScraper:
         
         return comments
     
-    def _extract_with_direct_api(self, url):
-        """Try direct API-like extraction using alternative ScrapFly config"""
+    def _extract_with_direct_api(self, url, target_count=None):
+        """
+        Try direct API-like extraction using alternative ScrapFly config
+        
+        Args:
+            url (str): Instagram post URL
+            target_count (int): Stop extracting once this many comments are found
+            
+        Returns:
+            list: Extracted comments
+        """
         comments = []
         
         try:
@@ -740,15 +823,15 @@ class InstagramScraper:
                 html = result.content
                 
                 # Strategy 1: Look for proper Instagram GraphQL data
-                comments.extend(self._extract_from_graphql_data(html))
+                comments.extend(self._extract_from_graphql_data(html, target_count))
                 
                 # Strategy 2: Look for comment structure in HTML
                 if len(comments) == 0:
-                    comments.extend(self._extract_from_comment_html(html))
+                    comments.extend(self._extract_from_comment_html(html, target_count))
                 
                 # Strategy 3: Look for any JSON with comment-like structure
                 if len(comments) == 0:
-                    comments.extend(self._extract_from_json_fallback(html))
+                    comments.extend(self._extract_from_json_fallback(html, target_count))
                 
                 if len(comments) > 0:
                     print(f"Extracted {len(comments)} comments via direct API approach")
@@ -758,23 +841,25 @@ class InstagramScraper:
         
         return comments
     
-    def _extract_from_graphql_data(self, html):
-        """Extract from Instagram GraphQL API data"""
+    def _extract_from_graphql_data(self, html, target_count=None):
+        """Extract from Instagram GraphQL API data, up to target_count comments"""
         comments = []
         
         try:
-            # Look for GraphQL responses in the HTML
-            graphql_patterns = [
-                r'"edge_media_to_comment":\s*\{[^}]*"edges":\s*\[([^\]]+)\]',
-                r'"comments":\s*\{[^}]*"edges":\s*\[([^\]]+)\]',
-                r'"node":\s*\{[^}]*"text":\s*"([^"]+)"[^}]*"owner":\s*\{[^}]*"username":\s*"([^"]+)"'
-            ]
-            
-            for pattern in graphql_patterns:
-                matches = re.findall(pattern, html, re.DOTALL)
-                if matches:
-                    print(f"Found GraphQL data with pattern")
-                    # Process GraphQL data
+            # Locate each GraphQL comment connection and parse just that object
+            for key in _GRAPHQL_COMMENT_KEYS:
+                pos = html.find(key)
+                while pos > -1 and not comments:
+                    payload = self._slice_json_object(html, pos + len(key))
+                    if payload and '"edges"' in payload:
+                        try:
+                            comments = self._parse_comment_json(orjson.loads(payload), target_count)
+                        except orjson.JSONDecodeError:
+                            pass
+                    pos = html.find(key, pos + len(key))
+                
+                if comments:
+                    print(f"Found GraphQL data with {key} ({len(comments)} comments)")
                     break
             
         except Exception as e:
@@ -782,13 +867,47 @@ class InstagramScraper:
         
         return comments
     
-    def _extract_from_comment_html(self, html):
+    def _slice_json_object(self, html, pos):
+        """
+        Return the JSON object that is the value following a key at html[pos:]
+        
+        Args:
+            html (str): Page HTML
+            pos (int): Index just after the quoted key
+            
+        Returns:
+            str: The balanced '{...}' text, or None if no object value starts there
+        """
+        colon = html.find(':', pos, pos + 20)
+        if colon == -1:
+            return None
+        
+        start = colon + 1
+        while start < len(html) and html[start] in ' \t\r\n':
+            start += 1
+        if not html.startswith('{', start):
+            return None
+        
+        # Count brackets, letting the regex skip over string contents in C
+        depth = 0
+        for token in _JSON_TOKEN_RE.finditer(html, start):
+            char = token.group()
+            if char in '{[':
+                depth += 1
+            elif char in '}]':
+                depth -= 1
+                if depth == 0:
+                    return html[start:token.end()]
+        return None
+    
+    def _extract_from_comment_html(self, html, target_count=None):
         """Extract comments from HTML structure with better parsing"""
         comments = []
+        limit = min(target_count or _COMMENT_HTML_LIMIT, _COMMENT_HTML_LIMIT)
         
         try:
             from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, _HTML_PARSER)
             
             # Look for comment-like structures with username links
             selectors = [
@@ -811,11 +930,14 @@ class InstagramScraper:
             print(f"Found {len(found_usernames)} potential usernames: {list(found_usernames)[:5]}")
             
             # Second pass: find text that might be comments near these usernames
-            for username in list(found_usernames)[:20]:  # Limit to first 20 users
+            target_usernames = list(found_usernames)[:20]  # Limit to first 20 users
+            elements_by_username = self._find_username_text_nodes(soup, target_usernames, per_user_limit=5)
+            
+            for username in target_usernames:
                 # Look for elements containing this username
-                username_elements = soup.find_all(text=re.compile(username, re.IGNORECASE))
+                username_elements = elements_by_username[username]
                 
-                for elem in username_elements[:5]:  # Limit per user
+                for elem in username_elements:
                     parent = elem.parent if elem.parent else elem
                     
                     # Get surrounding text
@@ -831,7 +953,7 @@ class InstagramScraper:
                     # Validate if this looks like a comment
                     if (len(comment_text) > 10 and 
                         len(comment_text) < 500 and
-                        not any(skip in comment_text.lower() for skip in ['follow', 'following', 'followers', 'posts', 'view profile'])):
+                        not _COMMENT_HTML_SKIP_RE.search(comment_text)):
                         
                         comment = {
                             'comment_id': len(comments) + 1,
@@ -849,10 +971,10 @@ class InstagramScraper:
                         }
                         comments.append(comment)
                         
-                        if len(comments) >= 50:  # Reasonable limit
+                        if len(comments) >= limit:
                             break
                 
-                if len(comments) >= 50:
+                if len(comments) >= limit:
                     break
             
             if len(comments) > 0:
@@ -863,9 +985,44 @@ class InstagramScraper:
         
         return comments
     
-    def _extract_from_json_fallback(self, html):
+    def _find_username_text_nodes(self, soup, usernames, per_user_limit=5):
+        """
+        Collect the text nodes mentioning each username in a single DOM walk
+        
+        Args:
+            soup (BeautifulSoup): Parsed page
+            usernames (list): Usernames to look for (case-insensitive)
+            per_user_limit (int): Maximum nodes kept per username
+            
+        Returns:
+            dict: username -> list of matching text nodes in document order
+        """
+        nodes_by_username = {username: [] for username in usernames}
+        if not usernames:
+            return nodes_by_username
+        
+        # One alternation for all usernames; longest first so overlapping names resolve to the full one
+        by_lower = {}
+        for username in usernames:
+            by_lower.setdefault(username.lower(), []).append(username)
+        pattern = re.compile(
+            '|'.join(re.escape(name) for name in sorted(by_lower, key=len, reverse=True)),
+            re.IGNORECASE
+        )
+        
+        for node in soup.find_all(string=pattern):
+            for name in {match.lower() for match in pattern.findall(node)}:
+                for username in by_lower[name]:
+                    matched_nodes = nodes_by_username[username]
+                    if len(matched_nodes) < per_user_limit:
+                        matched_nodes.append(node)
+        
+        return nodes_by_username
+    
+    def _extract_from_json_fallback(self, html, target_count=None):
         """Fallback JSON extraction with better username and likes parsing"""
         comments = []
+        limit = min(target_count or _JSON_FALLBACK_LIMIT, _JSON_FALLBACK_LIMIT)
         
         try:
             # Enhanced patterns to capture comment data including likes
@@ -886,8 +1043,8 @@ class InstagramScraper:
             extracted_comments = []
             
             for pattern in comment_patterns:
-                matches = re.findall(pattern, html, re.DOTALL)
-                for match in matches:
+                for found in re.finditer(pattern, html, re.DOTALL):
+                    match = found.groups()
                     if len(match) >= 2:  # At least text and username
                         
                         # Parse based on pattern structure
@@ -918,6 +1075,10 @@ class InstagramScraper:
                                 'username': clean_username,
                                 'likes': likes
                             })
+                            
+                            # Anything past the limit would be discarded below
+                            if len(extracted_comments) >= limit:
+                                break
                 
                 if extracted_comments:
                     break  # Use first successful pattern
@@ -939,80 +1100,87 @@ class InstagramScraper:
                 ]
                 
                 for pattern in comment_node_patterns:
-                    matches = re.findall(pattern, html, re.DOTALL)
-                    
-                    if matches:
-                        self.logger.debug(f"Found {len(matches)} comments with pattern")
-                        
-                        for match in matches:
-                            if len(match) >= 2:  # At least text and username
-                                text = match[0]
-                                username = match[1]
-                                likes = int(match[2]) if len(match) > 2 and match[2] and match[2].isdigit() else 0
+                    for found in re.finditer(pattern, html, re.DOTALL):
+                        match = found.groups()
+                        if len(match) >= 2:  # At least text and username
+                            text = match[0]
+                            username = match[1]
+                            likes = int(match[2]) if len(match) > 2 and match[2] and match[2].isdigit() else 0
+                            
+                            if (len(text) > 3 and len(text) < 500 and 
+                                not _JSON_NODE_SKIP_RE.search(text)):
                                 
-                                if (len(text) > 3 and len(text) < 500 and 
-                                    not any(skip in text.lower() for skip in ['loading', 'follow', 'profile', 'instagram', 'see original'])):
-                                    
-                                    # Apply Unicode cleaning
-                                    clean_text = self._clean_extracted_text(text)
-                                    clean_username = self._normalize_username(username)
-                                    
-                                    extracted_comments.append({
-                                        'text': clean_text,
-                                        'username': clean_username,
-                                        'likes': likes
-                                    })
-                                    
-                                    self.logger.debug(f"Extracted: @{clean_username} - '{clean_text[:40]}...' ({likes} likes)")
-                        
-                        if extracted_comments:
-                            break
+                                # Apply Unicode cleaning
+                                clean_text = self._clean_extracted_text(text)
+                                clean_username = self._normalize_username(username)
+                                
+                                extracted_comments.append({
+                                    'text': clean_text,
+                                    'username': clean_username,
+                                    'likes': likes
+                                })
+                                
+                                self.logger.debug(f"Extracted: @{clean_username} - '{clean_text[:40]}...' ({likes} likes)")
+                                
+                                if len(extracted_comments) >= limit:
+                                    break
+                    
+                    if extracted_comments:
+                        self.logger.debug(f"Found {len(extracted_comments)} comments with pattern")
+                        break
                 
                 # Last resort: separate extraction but with better validation
                 if not extracted_comments:
                     self.logger.debug("Using separate text/username extraction with validation")
                     
-                    text_matches = re.findall(r'"text"\s*:\s*"([^"]{10,300})"', html)
+                    # Single pass over the HTML for each pattern, then pair by position
+                    username_matches = list(_USERNAME_CTX_RE.finditer(html))
+                    username_positions = [m.start() for m in username_matches]
+                    likes_matches = list(_LIKES_CTX_RE.finditer(html))
+                    likes_positions = [m.start() for m in likes_matches]
                     
-                    # For each text, try to find the associated username nearby
-                    for text in text_matches[:20]:
-                        if not any(skip in text.lower() for skip in ['loading', 'follow', 'profile', 'instagram']):
+                    # For each text, find the associated username nearby
+                    for text_match in itertools.islice(_TEXT_RE.finditer(html), 20):
+                        text = text_match.group(1)
+                        if _JSON_TEXT_SKIP_RE.search(text):
+                            continue
+                        
+                        # Look in a reasonable context around the text
+                        text_pos = text_match.start(1) - 1
+                        context_start = max(0, text_pos - _CONTEXT_RADIUS)
+                        context_end = min(len(html), text_pos + _CONTEXT_RADIUS)
+                        
+                        # First username/likes match inside the context window
+                        username_match = self._first_match_in_window(
+                            username_matches, username_positions, context_start, context_end
+                        )
+                        likes_match = self._first_match_in_window(
+                            likes_matches, likes_positions, context_start, context_end
+                        )
+                        
+                        if username_match:
+                            raw_username = username_match.group(1)
+                            likes = int(likes_match.group(1)) if likes_match else 0
                             
-                            # Find text position and look for username context
-                            text_pos = html.find(f'"{text}"')
-                            if text_pos > -1:
-                                # Look in a reasonable context around the text
-                                context_start = max(0, text_pos - 500)
-                                context_end = min(len(html), text_pos + 500)
-                                context = html[context_start:context_end]
-                                
-                                # Find username in this context
-                                username_match = re.search(r'"username":\s*"([^"]+)"', context)
-                                likes_match = re.search(r'"(?:like_count|count)":\s*(\d+)', context)
-                                
-                                if username_match:
-                                    raw_username = username_match.group(1)
-                                    likes = int(likes_match.group(1)) if likes_match else 0
-                                    
-                                    # Apply Unicode cleaning
-                                    clean_text = self._clean_extracted_text(text)
-                                    clean_username = self._normalize_username(raw_username)
-                                    
-                                    extracted_comments.append({
-                                        'text': clean_text,
-                                        'username': clean_username,
-                                        'likes': likes
-                                    })
-                                    
-                                    self.logger.debug(f"Context match: @{clean_username} - '{clean_text[:30]}...' ({likes} likes)")
-                                    
-                                    if len(extracted_comments) >= 20:
-                                        break
+                            # Apply Unicode cleaning
+                            clean_text = self._clean_extracted_text(text)
+                            clean_username = self._normalize_username(raw_username)
+                            
+                            extracted_comments.append({
+                                'text': clean_text,
+                                'username': clean_username,
+                                'likes': likes
+                            })
+                            
+                            self.logger.debug(f"Context match: @{clean_username} - '{clean_text[:30]}...' ({likes} likes)")
+                            
+                            if len(extracted_comments) >= limit:
+                                break
             
             # Convert to final comment format
-            for i, comment_data in enumerate(extracted_comments[:20]):
-                comment = {
-                    'comment_id': len(comments) + 1,
+            comments = [
+                {
+                    'comment_id': i,
                     'nickname': comment_data['username'],
                     'username': f'@{comment_data["username"]}',
                     'user_url': f'https://www.instagram.com/{comment_data["username"]}/',
@@ -1025,7 +1193,8 @@ class InstagramScraper:
                     'replied_to': '',
                     'num_replies': 0
                 }
-                comments.append(comment)
+                for i, comment_data in enumerate(extracted_comments[:limit], start=1)
+            ]
             
             if len(comments) > 0:
                 likes_found = sum(1 for c in comments if c['likes'] > 0)
@@ -1036,21 +1205,50 @@ class InstagramScraper:
         
         return comments
     
-    def _remove_duplicate_comments(self, comments):
-        """Remove duplicate comments based on text similarity"""
-        if not comments:
-            return []
+    def _first_match_in_window(self, matches, positions, start, end):
+        """Return the first match fully contained in html[start:end], or None"""
+        idx = bisect.bisect_left(positions, start)
+        if idx < len(matches) and matches[idx].end() <= end:
+            return matches[idx]
+        return None
+    
+    def _dedup_and_group(self, comments, limit):
+        """
+        Remove duplicate comments and group the survivors by user in one pass
         
+        Args:
+            comments (list): Extracted comments, in priority order
+            limit (int): Maximum number of unique comments to keep
+            
+        Returns:
+            tuple: (unique_comments, unique_users) where unique_users maps each
+                real username (without '@') to its comments
+        """
         unique_comments = []
+        unique_users = defaultdict(list)
         seen_texts = set()
         
         for comment in comments:
-            text = comment.get('text', '').strip().lower()
-            if text and text not in seen_texts and len(text) > 3:
-                seen_texts.add(text)
-                unique_comments.append(comment)
+            if len(unique_comments) >= limit:
+                break
+            
+            text = comment.get('text', '').strip()
+            if len(text) <= 3:
+                continue
+            
+            # Lowercase once, only for candidates that can be kept
+            key = text.lower()
+            if key in seen_texts:
+                continue
+            seen_texts.add(key)
+            unique_comments.append(comment)
+            
+            # Placeholder 'user_N' names have no profile to enrich
+            username = comment.get('username', '').lstrip('@')
+            if username and 'user_' not in username:
+                unique_users[username].append(comment)
         
-        return unique_comments
+        return unique_comments, unique_users
     
     def _format_timestamp(self, timestamp):
         """Format timestamp to readable date"""
@@ -1064,23 +1262,23 @@ class InstagramScraper:
                 pass
         return 'N/A'
     
-    def _enrich_with_followers(self, comments):
-        """Enrich comments with follower data for real users"""
+    def _enrich_with_followers(self, comments, unique_users):
+        """
+        Enrich comments with follower data for real users
+        
+        Args:
+            comments (list): Comments to enrich
+            unique_users (dict): username -> comments, as built by _dedup_and_group
+            
+        Returns:
+            list: The same comments with 'followers' filled in
+        """
         if not comments:
             self.logger.debug("No comments to enrich with follower data")
             return comments
         
         self.logger.info(f"Starting follower enrichment for {len(comments)} comments")
         
-        # Get unique users to avoid duplicate API calls
-        unique_users = {}
-        for comment in comments:
-            username = comment.get('username', '').replace('@', '')
-            if username and username not in unique_users and 'user_' not in username:
-                unique_users[username] = []
-            if username in unique_users:
-                unique_users[username].append(comment)
-        
         self.logger.info(f"Found {len(unique_users)} unique users for follower enrichment")
         self.logger.debug(f"Users to process: {list(unique_users.keys())[:10]}")  # Log first 10
         
@@ -1125,7 +1323,21 @@ class InstagramScraper:
         return comments
     
     def _get_user_followers(self, username):
-        """Get follower count for a specific user"""
+        """Get follower count for a specific user, reusing earlier lookups"""
+        key = username.lower()
+        cached = self._follower_cache.get(key)
+        if cached:
+            followers, fetched_at = cached
+            if followers != 'N/A' or time.time() - fetched_at < _FOLLOWER_MISS_TTL:
+                self.logger.debug(f"Using cached follower data for @{username}: {followers}")
+                return followers
+        
+        followers = self._fetch_user_followers(username)
+        self._follower_cache[key] = (followers, time.time())
+        return followers
+    
+    def _fetch_user_followers(self, username):
+        """Fetch follower count for a specific user from their profile page"""
         try:
             user_url = f"https://www.instagram.com/{username}/"
             self.logger.debug(f"Fetching follower data for @{username}")
@@ -1155,32 +1367,22 @@ class InstagramScraper:
                 html = result['data']
                 self.logger.log_response(user_url, 200, len(html))
                 
-                # Look for follower count patterns
-                patterns = [
-                    r'"edge_followed_by":\s*{\s*"count":\s*(\d+)',
-                    r'"follower_count":(\d+)',
-                    r'(\d+(?:,\d+)*)\s*followers',
-                    r'(\d+(?:\.\d+)?[KMB]?)\s*followers'
-                ]
-                
-                for i, pattern in enumerate(patterns):
-                    match = re.search(pattern, html, re.IGNORECASE)
-                    if match:
-                        count_str = match.group(1).replace(',', '')
-                        self.logger.debug(f"Found follower data for @{username} using pattern {i+1}: {count_str}")
-                        
-                        # Handle abbreviated numbers (K, M, B)
-                        if 'K' in count_str.upper():
-                            result_count = f"{float(count_str.replace('K', '').replace('k', '')) * 1000:.0f}"
-                        elif 'M' in count_str.upper():
-                            result_count = f"{float(count_str.replace('M', '').replace('m', '')) * 1000000:.0f}"
-                        elif 'B' in count_str.upper():
-                            result_count = f"{float(count_str.replace('B', '').replace('b', '')) * 1000000000:.0f}"
-                        else:
-                            result_count = self._format_number(int(float(count_str)))
-                        
-                        self.logger.debug(f"Parsed follower count for @{username}: {result_count}")
-                        return result_count
+                # Look for follower count patterns in a single scan
+                match = self._find_follower_match(html)
+                if match:
+                    pattern_index = match.lastindex
+                    count_str = match.group(pattern_index).replace(',', '')
+                    self.logger.debug(f"Found follower data for @{username} using pattern {pattern_index}: {count_str}")
+                    
+                    # Handle abbreviated numbers (K, M, B)
+                    multiplier = _SUFFIX_MULTIPLIERS.get(count_str[-1])
+                    if multiplier:
+                        result_count = f"{float(count_str[:-1]) * multiplier:.0f}"
+                    else:
+                        result_count = self._format_number(int(float(count_str)))
+                    
+                    self.logger.debug(f"Parsed follower count for @{username}: {result_count}")
+                    return result_count
                 
                 self.logger.warning(f"No follower pattern matched for @{username}")
                 return 'N/A'
@@ -1200,16 +1402,22 @@ class InstagramScraper:
         
         return 'N/A'
     
+    def _find_follower_match(self, html):
+        """Return the most reliable follower count match in html, or None"""
+        best = None
+        for match in _FOLLOWER_RE.finditer(html):
+            if best is None or match.lastindex < best.lastindex:
+                best = match
+                if best.lastindex == 1:
+                    break
+        return best
+    
     def _format_number(self, number):
         """Format large numbers with K/M/B suffixes"""
-        if number >= 1_000_000_000:
-            return f"{number/1_000_000_000:.1f}B"
-        elif number >= 1_000_000:
-            return f"{number/1_000_000:.1f}M"
-        elif number >= 1_000:
-            return f"{number/1_000:.1f}K"
-        else:
+        idx = bisect.bisect_right(_NUMBER_THRESHOLDS, number)
+        if idx == 0:
             return str(number)
+        return f"{number/_NUMBER_THRESHOLDS[idx - 1]:.1f}{_NUMBER_SUFFIXES[idx - 1]}"
     
     def get_post_id(self, url):
         """Extract post ID from URL"""
@@ -5,24 +5,224 @@ Focuses on actual data extraction rather than placeholders
 """
 
 import re
-import json
-import time
-import random
-from bs4 import BeautifulSoup
+import orjson
+import itertools
+import functools
+from html import unescape
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
+from scrapfly import ScrapeConfig
 from utils.scrapfly_config import ScrapFlyConfig
+from utils.page_cache import PageCache
+
+# Use RE2 (linear-time, no backtracking) for the patterns that scan whole pages;
+# fall back to re if google-re2 is not installed
+try:
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
+
+# Embedded JSON blobs that may hold comments, in the order they are tried. Each
+# pattern is keyed by the literal it starts with: one scan for the three literals
+# finds every candidate, and each pattern is then matched only at its own starts.
+# The anchored patterns use re, not RE2: the re2 wrapper re-encodes the whole page
+# on every match(html, pos) call, which would make the scan O(page x hits).
+_SHARED_DATA_RE = re.compile(r'window\._sharedData\s*=\s*({.+?});', re.DOTALL)
+_EDGE_COMMENTS_RE = re.compile(r'"edge_media_to_comment"\s*:\s*({.+?"edges"\s*:\s*\[.+?\]})', re.DOTALL)
+_COMMENTS_ARR_RE = re.compile(r'"comments"\s*:\s*(\[.+?\])', re.DOTALL)
+_EMBEDDED_JSON_RES = (
+    ('window._sharedData', _SHARED_DATA_RE),
+    ('"edge_media_to_comment"', _EDGE_COMMENTS_RE),
+    ('"comments"', _COMMENTS_ARR_RE),
+)
+_EMBEDDED_JSON_START_RE = _fast_re.compile(r'window\._sharedData|"edge_media_to_comment"|"comments"')
+
+# JSON strings (skipped whole) and brackets, for slicing balanced objects out of a page
+_JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+# JSON-LD script bodies, read straight from the page without building a DOM
+_LD_JSON_RE = re.compile(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+# og:title / og:description meta tags, in either attribute order
+_OG_TITLE_RES = (
+    re.compile(r'<meta[^>]*property=["\']og:title["\'][^>]*content=(["\'])(.*?)\1', re.IGNORECASE),
+    re.compile(r'<meta[^>]*content=(["\'])(.*?)\1[^>]*property=["\']og:title["\']', re.IGNORECASE)
+)
+_OG_DESCRIPTION_RES = (
+    re.compile(r'<meta[^>]*property=["\']og:description["\'][^>]*content=(["\'])(.*?)\1', re.IGNORECASE),
+    re.compile(r'<meta[^>]*content=(["\'])(.*?)\1[^>]*property=["\']og:description["\']', re.IGNORECASE)
+)
+
+# Profile links ("/username/") inside comment elements
+_USER_HREF_RE = re.compile(r'^/[\w.]+/?$')
+_USERNAME_MENTION_RE = re.compile(r'@(\w+)')
+
+# UI labels that mark a DOM text as not being a comment (one case-insensitive scan)
+_HTML_SKIP_RE = re.compile(r'follow|like|share|view profile', re.IGNORECASE)
+
+# Post, reel and IGTV URL formats
+_POST_ID_RES = [re.compile(pattern) for pattern in (
+    r'/p/([A-Za-z0-9_-]+)',
+    r'/reel/([A-Za-z0-9_-]+)',
+    r'/tv/([A-Za-z0-9_-]+)'
+)]
+
+# Injected into the post page to load all comments before the HTML is returned;
+# built once at import instead of on every scrape
+_IMPROVED_JS_CODE = """
+    async function extractInstagramData() {
+        console.log('Starting improved Instagram data extraction...');
+        
+        // Wait for page to load
+        await new Promise(resolve => setTimeout(resolve, 5000));
+        
+        // Function to scroll and load comments
+        async function loadAllComments() {
+            let previousHeight = 0;
+            let currentHeight = document.body.scrollHeight;
+            let attempts = 0;
+            const maxAttempts = 10;
+            
+            while (attempts < maxAttempts && currentHeight > previousHeight) {
+                previousHeight = currentHeight;
+                
+                // Scroll to bottom
+                window.scrollTo(0, document.body.scrollHeight);
+                await new Promise(resolve => setTimeout(resolve, 3000));
+                
+                // Try to click "View more comments" buttons
+                const viewMoreButtons = document.querySelectorAll('button, span, div');
+                for (const button of viewMoreButtons) {
+                    const text = button.textContent.toLowerCase();
+                    if (text.includes('view more') || text.includes('ver más') || 
+                        text.includes('load more') || text.includes('mostrar más')) {
+                        try {
+                            button.click();
+                            await new Promise(resolve => setTimeout(resolve, 2000));
+                        } catch (e) {}
+                    }
+                }
+                
+                currentHeight = document.body.scrollHeight;
+                attempts++;
+            }
+            
+            console.log(`Completed loading after ${attempts} attempts`);
+        }
+        
+        // Load all comments
+        await loadAllComments();
+        
+        // Extract window._sharedData or other embedded data
+        let embeddedData = {};
+        
+        // Try to find _sharedData
+        if (window._sharedData) {
+            embeddedData._sharedData = window._sharedData;
+        }
+        
+        // Try to find other embedded JSON data
+        const scripts = document.querySelectorAll('script[type="application/ld+json"]');
+        embeddedData.jsonLD = [];
+        scripts.forEach(script => {
+            try {
+                embeddedData.jsonLD.push(JSON.parse(script.textContent));
+            } catch (e) {}
+        });
+        
+        // Store embedded data in a global variable for extraction
+        window.extractedData = embeddedData;
+        
+        console.log('Extraction complete');
+        return document.documentElement.outerHTML;
+    }
+    
+    return extractInstagramData();
+"""
+
+# Request template for the no-JS direct API fallback
+_DIRECT_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'X-Requested-With': 'XMLHttpRequest'
+}
+_DIRECT_API_OPTIONS = {
+    'asp': True,
+    'render_js': False,  # Try without JS first
+    'proxy_pool': 'public_residential_pool',
+    'country': 'US'
+}
+
+@functools.lru_cache(maxsize=4096)
+def _user_strings(username):
+    """
+    Return the shared (@username, profile URL) pair for a commenter
+    
+    Users who comment many times on a thread reuse the same two strings instead of
+    building new ones per comment; the cache is bounded to keep memory flat.
+    """
+    return f'@{username}', f'https://www.instagram.com/{username}/'
+
+class Comment:
+    """
+    A single extracted comment
+    
+    Comments are held as slotted objects while the extraction strategies run and
+    are turned into plain dicts (to_dict) only for the ones that are returned.
+    """
+    __slots__ = (
+        'comment_id', 'nickname', 'username', 'user_url', 'text', 'timestamp', 'likes',
+        'profile_pic', 'followers', 'is_reply', 'replied_to', 'num_replies'
+    )
+    
+    def __init__(self, comment_id, nickname, username, user_url, text, timestamp='N/A', likes=0,
+                 profile_pic='', followers='N/A', is_reply=False, replied_to='', num_replies=0):
+        self.comment_id = comment_id
+        self.nickname = nickname
+        self.username = username
+        self.user_url = user_url
+        self.text = text
+        self.timestamp = timestamp
+        self.likes = likes
+        self.profile_pic = profile_pic
+        self.followers = followers
+        self.is_reply = is_reply
+        self.replied_to = replied_to
+        self.num_replies = num_replies
+    
+    def to_dict(self):
+        """Return the comment as the dict included in scrape_comments results"""
+        return {
+            'comment_id': self.comment_id,
+            'nickname': self.nickname,
+            'username': self.username,
+            'user_url': self.user_url,
+            'text': self.text,
+            'time': self.timestamp,
+            'likes': self.likes,
+            'profile_pic': self.profile_pic,
+            'followers': self.followers,
+            'is_reply': self.is_reply,
+            'replied_to': self.replied_to,
+            'num_replies': self.num_replies
+        }
 
 class ImprovedInstagramScraper:
     def __init__(self):
         self.scrapfly = ScrapFlyConfig()
         self.limits = self.scrapfly.get_platform_limits('instagram')
+        # Rendered post HTML, keyed by post ID
+        self.page_cache = PageCache()
         
-    def scrape_comments(self, url):
+    def scrape_comments(self, url, bypass_cache=False):
         """
         Extract real comments and user data from Instagram post/reel
         
         Args:
             url (str): Instagram post URL
+            bypass_cache (bool): Always render the page again, ignoring cached HTML
             
         Returns:
             dict: Result with success/error and extracted data
@@ -31,7 +231,7 @@ class ImprovedInstagramScraper:
             print(f"Starting Instagram scraping: {url[:50]}...")
             
             # Step 1: Get page with embedded JavaScript data
-            result = self._get_page_with_embedded_data(url)
+            result = self._get_page_with_embedded_data(url, bypass_cache)
             if not result['success']:
                 return result
             
@@ -60,9 +260,40 @@ class ImprovedInstagramScraper:
                 'data': None
             }
     
-    def _get_page_with_embedded_data(self, url):
+    def scrape_many(self, urls, concurrency=4):
+        """
+        Scrape several Instagram posts concurrently
+        
+        Each post spends most of its time waiting on ScrapFly (JS rendering and
+        network), so posts are scraped on a small thread pool sharing the client.
+        
+        Args:
+            urls (list): Instagram post URLs
+            concurrency (int): Maximum number of posts scraped at the same time
+            
+        Returns:
+            list: One scrape_comments result per URL, in the same order
+        """
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as executor:
+            return list(executor.map(self.scrape_comments, urls))
+    
+    def _get_page_with_embedded_data(self, url, bypass_cache=False):
         """Get Instagram page with embedded JSON data"""
         try:
+            # Post content rarely changes within hours, so reuse a recent render
+            cache_key = self.page_cache.make_key(self.get_post_id(url) or url, self._get_improved_js_code())
+            if not bypass_cache:
+                cached_html = self.page_cache.get(cache_key)
+                if cached_html is not None:
+                    print("Using cached page HTML")
+                    return {
+                        'success': True,
+                        'html': cached_html
+                    }
+            
             # Enhanced configuration for better data extraction
             config = self.scrapfly.create_scrape_config(url, 'instagram', {
                 'render_js': True,
@@ -74,6 +305,7 @@ class ImprovedInstagramScraper:
             result = self.scrapfly.scrape_with_retry(config)
             
             if result['success']:
+                self.page_cache.set(cache_key, result['data'])
                 return {
                     'success': True,
                     'html': result['data']
@@ -92,89 +324,17 @@ class ImprovedInstagramScraper:
     
     def _get_improved_js_code(self):
         """Improved JavaScript code for better comment extraction"""
-        return """
-        async function extractInstagramData() {
-            console.log('Starting improved Instagram data extraction...');
-            
-            // Wait for page to load
-            await new Promise(resolve => setTimeout(resolve, 5000));
-            
-            // Function to scroll and load comments
-            async function loadAllComments() {
-                let previousHeight = 0;
-                let currentHeight = document.body.scrollHeight;
-                let attempts = 0;
-                const maxAttempts = 10;
-                
-                while (attempts < maxAttempts && currentHeight > previousHeight) {
-                    previousHeight = currentHeight;
-                    
-                    // Scroll to bottom
-                    window.scrollTo(0, document.body.scrollHeight);
-                    await new Promise(resolve => setTimeout(resolve, 3000));
-                    
-                    // Try to click "View more comments" buttons
-                    const viewMoreButtons = document.querySelectorAll('button, span, div');
-                    for (const button of viewMoreButtons) {
-                        const text = button.textContent.toLowerCase();
-                        if (text.includes('view more') || text.includes('ver más') || 
-                            text.includes('load more') || text.includes('mostrar más')) {
-                            try {
-                                button.click();
-                                await new Promise(resolve => setTimeout(resolve, 2000));
-                            } catch (e) {}
-                        }
-                    }
-                    
-                    currentHeight = document.body.scrollHeight;
-                    attempts++;
-                }
-                
-                console.log(`Completed loading after ${attempts} attempts`);
-            }
-            
-            // Load all comments
-            await loadAllComments();
-            
-            // Extract window._sharedData or other embedded data
-            let embeddedData = {};
-            
-            // Try to find _sharedData
-            if (window._sharedData) {
-                embeddedData._sharedData = window._sharedData;
-            }
-            
-            // Try to find other embedded JSON data
-            const scripts = document.querySelectorAll('script[type="application/ld+json"]');
-            embeddedData.jsonLD = [];
-            scripts.forEach(script => {
-                try {
-                    embeddedData.jsonLD.push(JSON.parse(script.textContent));
-                } catch (e) {}
-            });
-            
-            // Store embedded data in a global variable for extraction
-            window.extractedData = embeddedData;
-            
-            console.log('Extraction complete');
-            return document.documentElement.outerHTML;
-        }
-        
-        return extractInstagramData();
-        """
+        return _IMPROVED_JS_CODE
     
     def _extract_post_metadata(self, html):
         """Extract post metadata from HTML"""
         metadata = {}
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract from JSON-LD
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
+            # Extract from JSON-LD (no DOM needed)
+            for script in _LD_JSON_RE.finditer(html):
                 try:
-                    data = json.loads(script.string)
+                    data = orjson.loads(script.group(1))
                     if isinstance(data, dict) and 'author' in data:
                         if 'author' in data:
                             author = data['author']
@@ -197,22 +357,29 @@ class ImprovedInstagramScraper:
             
             # Extract from meta tags as fallback
             if not metadata:
-                og_title = soup.find('meta', property='og:title')
-                if og_title:
-                    content = og_title.get('content', '')
-                    username_match = re.search(r'@(\w+)', content)
+                og_title = self._find_meta_content(html, _OG_TITLE_RES)
+                if og_title is not None:
+                    username_match = _USERNAME_MENTION_RE.search(og_title)
                     if username_match:
                         metadata['publisher_username'] = '@' + username_match.group(1)
                 
-                og_description = soup.find('meta', property='og:description')
-                if og_description:
-                    metadata['description'] = og_description.get('content', '')
+                og_description = self._find_meta_content(html, _OG_DESCRIPTION_RES)
+                if og_description is not None:
+                    metadata['description'] = og_description
             
         except Exception as e:
             print(f"Error extracting metadata: {str(e)}")
         
         return metadata
     
+    def _find_meta_content(self, html, patterns):
+        """Return the unescaped content of the first meta tag matched by patterns, or None"""
+        for pattern in patterns:
+            match = pattern.search(html)
+            if match:
+                return unescape(match.group(2))
+        return None
+    
     def _extract_real_comments(self, html, url):
         """Extract real comments from Instagram HTML"""
         comments = []
@@ -232,7 +399,7 @@ class ImprovedInstagramScraper:
             # Remove duplicates and limit results
             unique_comments = self._remove_duplicate_comments(comments)
             
-            return unique_comments[:self.limits['max_comments_per_video']]
+            return [comment.to_dict() for comment in unique_comments[:self.limits['max_comments_per_video']]]
             
         except Exception as e:
             print(f"Error extracting comments: {str(e)}")
@@ -243,19 +410,18 @@ class ImprovedInstagramScraper:
         comments = []
         
         try:
-            # Look for _sharedData in script tags
-            patterns = [
-                r'window\._sharedData\s*=\s*({.+?});',
-                r'"edge_media_to_comment"\s*:\s*({.+?"edges"\s*:\s*\[.+?\]})',
-                r'"comments"\s*:\s*(\[.+?\])',
-            ]
+            # Single pass over the page for where each kind of blob may start
+            starts = {literal: [] for literal, _ in _EMBEDDED_JSON_RES}
+            for start in _EMBEDDED_JSON_START_RE.finditer(html):
+                starts[start.group()].append(start.start())
             
-            for pattern in patterns:
-                matches = re.findall(pattern, html, re.DOTALL)
+            # Look for _sharedData in script tags
+            for literal, pattern in _EMBEDDED_JSON_RES:
+                matches = self._match_at_starts(pattern, html, starts[literal])
                 for match in matches:
                     try:
                         if match.startswith('{'):
-                            data = json.loads(match)
+                            data = orjson.loads(match)
                             extracted = self._parse_comment_json(data)
                             if extracted:
                                 comments.extend(extracted)
@@ -273,6 +439,22 @@ class ImprovedInstagramScraper:
         
         return comments
     
+    def _match_at_starts(self, pattern, html, starts):
+        """
+        Return group 1 of each non-overlapping match of pattern anchored at one of
+        starts (ascending offsets), the same matches pattern.findall would return
+        """
+        matches = []
+        end = -1
+        for start in starts:
+            if start < end:
+                continue
+            match = pattern.match(html, start)
+            if match:
+                matches.append(match.group(1))
+                end = match.end()
+        return matches
+    
     def _parse_comment_json(self, data):
         """Parse comments from JSON data structure"""
         comments = []
@@ -292,64 +474,50 @@ class ImprovedInstagramScraper:
                         edge_comments = media.get('edge_media_to_comment', {})
                         edges = edge_comments.get('edges', [])
                         
-                        for i, edge in enumerate(edges):
-                            node = edge.get('node', {})
-                            if node.get('text'):
-                                owner = node.get('owner', {})
-                                username = owner.get('username', f'user_{i+1}')
-                                
-                                comment = {
-                                    'comment_id': i + 1,
-                                    'nickname': owner.get('full_name', username),
-                                    'username': f'@{username}',
-                                    'user_url': f'https://www.instagram.com/{username}/',
-                                    'text': node.get('text', ''),
-                                    'time': self._format_timestamp(node.get('created_at')),
-                                    'likes': node.get('edge_liked_by', {}).get('count', 0),
-                                    'profile_pic': owner.get('profile_pic_url', ''),
-                                    'followers': 'N/A',
-                                    'is_reply': False,
-                                    'replied_to': '',
-                                    'num_replies': 0
-                                }
-                                comments.append(comment)
+                        self._build_comments_from_edges(edges, comments)
             
             # Handle direct comment edge structure
             elif 'edges' in data:
-                edges = data['edges']
-                for i, edge in enumerate(edges):
-                    node = edge.get('node', {})
-                    if node.get('text'):
-                        owner = node.get('owner', {})
-                        username = owner.get('username', f'user_{i+1}')
-                        
-                        comment = {
-                            'comment_id': i + 1,
-                            'nickname': owner.get('full_name', username),
-                            'username': f'@{username}',
-                            'user_url': f'https://www.instagram.com/{username}/',
-                            'text': node.get('text', ''),
-                            'time': self._format_timestamp(node.get('created_at')),
-                            'likes': node.get('edge_liked_by', {}).get('count', 0),
-                            'profile_pic': owner.get('profile_pic_url', ''),
-                            'followers': 'N/A',
-                            'is_reply': False,
-                            'replied_to': '',
-                            'num_replies': 0
-                        }
-                        comments.append(comment)
+                self._build_comments_from_edges(data['edges'], comments)
             
         except Exception as e:
             print(f"Error parsing comment JSON: {str(e)}")
         
         return comments
     
+    def _build_comments_from_edges(self, edges, comments):
+        """Append a Comment to comments for each GraphQL comment edge ({'node': {...}}) with text"""
+        comments.extend([
+            self._build_comment(i, node)
+            for i, edge in enumerate(edges)
+            for node in (edge.get('node') or {},)
+            if node.get('text')
+        ])
+    
+    def _build_comment(self, i, node):
+        """Build the Comment for the i-th GraphQL comment node"""
+        owner = node.get('owner') or {}
+        username = owner.get('username', f'user_{i+1}')
+        at_username, user_url = _user_strings(username)
+        
+        return Comment(
+            comment_id=i + 1,
+            nickname=owner.get('full_name', username),
+            username=at_username,
+            user_url=user_url,
+            text=node['text'],
+            timestamp=self._format_timestamp(node.get('created_at')),
+            likes=(node.get('edge_liked_by') or {}).get('count', 0),
+            profile_pic=owner.get('profile_pic_url', '')
+        )
+    
     def _extract_from_html_structure(self, html):
         """Extract comments from HTML DOM structure"""
         comments = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # Only comment extraction needs a DOM; metadata is read with regexes
+            tree = LexborHTMLParser(html)
             
             # Look for comment-like structures
             selectors = [
@@ -360,36 +528,29 @@ class ImprovedInstagramScraper:
             ]
             
             for selector in selectors:
-                elements = soup.select(selector)
+                elements = tree.css(selector)
                 
                 for i, element in enumerate(elements):
                     # Look for username link
-                    user_link = element.find('a', href=re.compile(r'^/[\w.]+/?$'))
+                    user_link = self._find_user_link(element)
                     if user_link:
-                        username = user_link.get('href', '').strip('/').split('/')[0]
+                        href = user_link.attributes.get('href') or ''
+                        username = href.strip('/').split('/')[0]
                         
                         # Get comment text (excluding username)
-                        full_text = element.get_text(strip=True)
+                        full_text = element.text(deep=True, separator='', strip=True)
                         comment_text = full_text.replace(username, '').strip()
                         
                         # Skip if it doesn't look like a real comment
-                        if (len(comment_text) > 3 and 
-                            not any(skip in comment_text.lower() for skip in ['follow', 'like', 'share', 'view profile'])):
+                        if len(comment_text) > 3 and not _HTML_SKIP_RE.search(comment_text):
                             
-                            comment = {
-                                'comment_id': len(comments) + 1,
-                                'nickname': username,
-                                'username': f'@{username}',
-                                'user_url': f'https://www.instagram.com{user_link.get("href", "")}',
-                                'text': comment_text,
-                                'time': 'N/A',
-                                'likes': 0,
-                                'profile_pic': '',
-                                'followers': 'N/A',
-                                'is_reply': False,
-                                'replied_to': '',
-                                'num_replies': 0
-                            }
+                            comment = Comment(
+                                comment_id=len(comments) + 1,
+                                nickname=username,
+                                username=_user_strings(username)[0],
+                                user_url=f'https://www.instagram.com{href}',
+                                text=comment_text
+                            )
                             comments.append(comment)
                 
                 if len(comments) > 0:
@@ -401,53 +562,43 @@ class ImprovedInstagramScraper:
         
         return comments
     
+    def _find_user_link(self, element):
+        """Return the first <a> under element whose href is a profile link"""
+        for link in element.css('a[href]'):
+            if _USER_HREF_RE.search(link.attributes.get('href') or ''):
+                return link
+        return None
+    
     def _extract_with_direct_api(self, url):
         """Try direct API-like extraction using alternative ScrapFly config"""
         comments = []
         
         try:
             # Use a different approach with specific headers for API-like access
-            from scrapfly import ScrapeConfig
-            
-            config = ScrapeConfig(
-                url=url,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'X-Requested-With': 'XMLHttpRequest'
-                },
-                asp=True,
-                render_js=False,  # Try without JS first
-                proxy_pool='public_residential_pool',
-                country='US'
-            )
+            config = ScrapeConfig(url=url, headers=dict(_DIRECT_API_HEADERS), **_DIRECT_API_OPTIONS)
             
             result = self.scrapfly.client.scrape(config)
             
             if result.success:
                 html = result.content
                 # Try to extract any embedded data
-                json_matches = re.findall(r'({[^{}]*"text"[^{}]*})', html)
+                json_matches = self._iter_json_objects_with_key(html, '"text"')
                 
-                for i, match in enumerate(json_matches[:20]):  # Limit to 20 matches
+                for i, match in enumerate(itertools.islice(json_matches, 20)):  # Limit to 20 matches
                     try:
-                        data = json.loads(match)
+                        data = orjson.loads(match)
                         if 'text' in data and len(data['text']) > 3:
-                            comment = {
-                                'comment_id': i + 1,
-                                'nickname': data.get('owner', {}).get('username', f'user_{i+1}'),
-                                'username': f'@{data.get("owner", {}).get("username", f"user_{i+1}")}',
-                                'user_url': f'https://www.instagram.com/{data.get("owner", {}).get("username", f"user_{i+1}")|}/',
-                                'text': data['text'],
-                                'time': 'N/A',
-                                'likes': data.get('edge_liked_by', {}).get('count', 0),
-                                'profile_pic': '',
-                                'followers': 'N/A',
-                                'is_reply': False,
-                                'replied_to': '',
-                                'num_replies': 0
-                            }
+                            owner = data.get('owner') or {}
+                            uname = owner.get('username') or f'user_{i+1}'
+                            at_username, user_url = _user_strings(uname)
+                            comment = Comment(
+                                comment_id=i + 1,
+                                nickname=uname,
+                                username=at_username,
+                                user_url=user_url,
+                                text=data['text'],
+                                likes=data.get('edge_liked_by', {}).get('count', 0)
+                            )
                             comments.append(comment)
                     except:
                         continue
@@ -460,6 +611,71 @@ class ImprovedInstagramScraper:
         
         return comments
     
+    def _iter_json_objects_with_key(self, html, key):
+        """
+        Yield every balanced JSON object in html that directly contains key
+        
+        Each <script> body (or the whole response, if it has none) is tokenized
+        once, front to back, keeping a stack of open brackets; string contents are
+        skipped whole, so braces inside captions are never counted. Each occurrence
+        of the quoted key is expanded to its enclosing '{...}', so objects with
+        nested values (e.g. "owner") are returned whole.
+        
+        Args:
+            html (str): Page HTML
+            key (str): Quoted key to look for, e.g. '"text"'
+        """
+        for body_start, body_end in self._script_bodies(html):
+            if html.find(key, body_start, body_end) == -1:
+                continue
+            
+            # Positions of the brackets that are still open at the current token
+            open_brackets = []
+            for token in _JSON_TOKEN_RE.finditer(html, body_start, body_end):
+                text = token.group()
+                if text == '{' or text == '[':
+                    open_brackets.append(token.start())
+                elif text == '}' or text == ']':
+                    if open_brackets:
+                        open_brackets.pop()
+                elif text == key and open_brackets and html[open_brackets[-1]] == '{':
+                    key_end = token.end()
+                    if html[key_end:key_end + 10].lstrip().startswith(':'):
+                        obj = self._slice_balanced_object(html, open_brackets[-1])
+                        if obj:
+                            yield obj
+    
+    def _script_bodies(self, html):
+        """Yield (start, end) of each <script> body in html, or of html itself if it has none"""
+        pos = html.find('<script')
+        if pos == -1:
+            yield 0, len(html)
+            return
+        
+        while pos != -1:
+            tag_end = html.find('>', pos)
+            if tag_end == -1:
+                return
+            end = html.find('</script>', tag_end)
+            if end == -1:
+                return
+            yield tag_end + 1, end
+            pos = html.find('<script', end)
+    
+    def _slice_balanced_object(self, html, start):
+        """Return html[start:] up to the bracket that closes the object opened at start"""
+        depth = 0
+        # Count brackets, letting the regex skip over string contents in C
+        for token in _JSON_TOKEN_RE.finditer(html, start):
+            char = token.group()
+            if char in '{[':
+                depth += 1
+            elif char in '}]':
+                depth -= 1
+                if depth == 0:
+                    return html[start:token.end()]
+        return None
+    
     def _remove_duplicate_comments(self, comments):
         """Remove duplicate comments based on text similarity"""
         if not comments:
@@ -469,9 +685,13 @@ class ImprovedInstagramScraper:
         seen_texts = set()
         
         for comment in comments:
-            text = comment.get('text', '').strip().lower()
-            if text and text not in seen_texts and len(text) > 3:
-                seen_texts.add(text)
+            text = comment.text.strip()
+            if len(text) <= 3:
+                continue
+            
+            text_lower = text.lower()
+            if text_lower not in seen_texts:
+                seen_texts.add(text_lower)
                 unique_comments.append(comment)
         
         return unique_comments
@@ -490,14 +710,8 @@ class ImprovedInstagramScraper:
     
     def get_post_id(self, url):
         """Extract post ID from URL"""
-        patterns = [
-            r'/p/([A-Za-z0-9_-]+)',
-            r'/reel/([A-Za-z0-9_-]+)',
-            r'/tv/([A-Za-z0-9_-]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _POST_ID_RES:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         
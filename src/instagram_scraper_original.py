@@ -4,17 +4,331 @@ Scraper específico para Instagram usando ScrapFly
 """
 
 import re
-import json
 import time
+from html import unescape
 import random
-from bs4 import BeautifulSoup
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
+from scrapfly import ScrapeConfig
 from utils.scrapfly_config import ScrapFlyConfig
+from utils.page_cache import PageCache
+
+# Motor RE2 (tiempo lineal) para los patrones que recorren páginas completas;
+# usar re si google-re2 no está instalado
+try:
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
+
+# Enlaces a perfiles de usuario ("/usuario/") usados al recorrer comentarios
+_PROFILE_LINK_RE = re.compile(r'^/[\w.]+/$')
+_PROFILE_LINK_LOOSE_RE = re.compile(r'^/[\w.]+/?$')
+_MENTION_RE = re.compile(r'@\w+')
+_USERNAME_CLASS_RE = re.compile(r'_ap3a|_aaco')
+_COMMENT_LIKES_RE = re.compile(r'\d+\s*(like|me gusta)', re.I)
+_NUMBER_RE = re.compile(r'(\d+)')
+
+# Metadatos del post
+_SHARED_DATA_RE = _fast_re.compile(r'window\._sharedData\s*=\s*({.+?});')
+_OG_USERNAME_RE = re.compile(r'@(\w+)')
+_LIKE_LABEL_RE = re.compile(r'like', re.I)
+_DESCRIPTION_COMMENTS_RE = re.compile(r'(\d+)\s+comments?', re.I)
+_META_TAG_RE = re.compile(r'<meta\b[^>]*>', re.I)
+_META_ATTR_RE = re.compile(r'(?<![\w-])(property|name|content)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+
+# Patrones para encontrar conteos de comentarios en una sola alternancia, para
+# recorrer el HTML completo una sola vez; usa RE2 si está disponible (flag inline
+# porque re2 no expone re.I). Cada alternativa captura el número en su propio grupo.
+_COMMENT_COUNT_RE = _fast_re.compile('(?i)' + '|'.join((
+    r'"comment_count":\s*(\d+)',
+    r'"edge_media_to_comment":\s*{\s*"count":\s*(\d+)',
+    r'(\d+)\s*comments?',  # "38 comments"
+    r'(\d+)\s*comentarios?',  # "38 comentarios"
+    r'"comments":\s*(\d+)',
+    r'View all (\d+) comments',
+    r'Ver (?:todos )?los (\d+) comentarios'
+)))
+
+# og:description del post sin comentarios ("12 likes, 0 comments - usuario on ...");
+# solo el prefijo de conteos, nunca el texto del pie de foto
+_OG_NO_COMMENTS_RE = re.compile(r'^[\d.,KkMm\s]+likes?,\s*0\s+comments?\b', re.I)
+
+# Patrones de seguidores en páginas de perfil en una sola alternancia; el número
+# de grupo indica la prioridad (1 = edge_followed_by ... 4 = texto "N followers")
+_FOLLOWER_RE = _fast_re.compile(
+    r'(?i)"edge_followed_by":\s*{\s*"count":\s*(\d+)'
+    r'|"follower_count":(\d+)'
+    r'|"followers":(\d+)'
+    r'|(\d+)\s*followers'
+)
+_META_FOLLOWERS_RE = re.compile(r'(\d+(?:,\d+)*)\s*followers', re.I)
+
+# Formatos de URL de posts, reels y videos de IGTV
+_POST_ID_RES = [_fast_re.compile(pattern) for pattern in (
+    r'/p/([A-Za-z0-9_-]+)',
+    r'/reel/([A-Za-z0-9_-]+)',
+    r'/tv/([A-Za-z0-9_-]+)'
+)]
+
+# Bloques JSON embebidos en el post que pueden contener comentarios (estrategia
+# alternativa), en el orden en que se procesan. Cada patrón va con el literal con el
+# que empieza: una sola pasada de _EMBEDDED_COMMENTS_START_RE encuentra todos los
+# candidatos y cada patrón se evalúa solo en sus posiciones.
+_EMBEDDED_COMMENTS_RES = tuple((literal, re.compile(pattern, re.DOTALL)) for literal, pattern in (
+    ('window.__additionalDataLoaded', r'window\.__additionalDataLoaded\([^)]+,\s*({.+?})\)'),
+    ('window._sharedData', r'window\._sharedData\s*=\s*({.+?});'),
+    ('"edge_media_to_comment"', r'"edge_media_to_comment"\s*:\s*({.+?"edges"\s*:\s*\[.+?\]})'),
+    ('"comment_count"', r'"comment_count"\s*:\s*(\d+)'),
+    ('"comments"', r'"comments"\s*:\s*(\[.+?\])')
+))
+_EMBEDDED_COMMENTS_START_RE = _fast_re.compile(
+    '|'.join(re.escape(literal) for literal, _ in _EMBEDDED_COMMENTS_RES)
+)
+
+# Selectores de comentarios de _process_comments, en orden de prioridad; se usa el
+# primero que encuentre elementos (específicos para Instagram 2025)
+_COMMENT_SELECTORS = (
+    # Selectores primarios para comentarios
+    'article section ul li div',                    # Estructura principal de comentarios
+    'article section div[role="button"]',           # Comentarios interactivos
+    'article section ul li',                        # Lista de comentarios básica
+    
+    # Selectores secundarios
+    'ul li span[class*="_ap3a"]',                   # Usernames con clase específica
+    'div[class*="_aacl"] span',                     # Texto de comentarios con contenedor
+    'article section div div span a',              # Enlaces de usuario en comentarios
+    
+    # Selectores de respaldo
+    '[data-testid*="comment"]',                     # Data testid genérico
+    'article section > div > div',                 # Estructura anidada
+    'section div[style*="flex"]',                   # Comentarios con flex layout
+    'article section div span[dir="auto"]'         # Texto direccional automático
+)
+
+# Textos de interfaz y señales de comentario real para _is_real_comment_text; cada
+# lista se compila como una sola alternancia de literales. Se usa re y no RE2: se
+# aplican a textos cortos, donde domina el costo fijo de cada llamada a re2
+_UI_TEXT_RE = re.compile('|'.join(re.escape(pattern) for pattern in (
+    'original audio', 'audio original', 'verified', 'verificado',
+    'follow', 'seguir', 'instagram', 'loading', 'cargando',
+    'view profile', 'ver perfil', 'likes', 'comments', 'comentarios'
+)))
+_REAL_COMMENT_RE = re.compile('|'.join(re.escape(indicator) for indicator in (
+    # Emotional/engaging content
+    '!', '?', '💙', '❤️', '😍', '👏',
+    
+    # Spanish words common in comments
+    'que', 'como', 'muy', 'super', 'bono', 'gracias', 'genial',
+    'excelente', 'bueno', 'trabajo', 'empresa', 'beneficio',
+    
+    # English words common in comments
+    'love', 'great', 'amazing', 'awesome', 'good', 'nice',
+    'thanks', 'thank you', 'congratulations',
+    
+    # Conversational patterns
+    '@', 'jaja', 'jeje', 'haha', 'lol'
+)))
+
+# Rutas de Instagram que no son perfiles (se comparan por igualdad con el primer
+# segmento del enlace)
+_NON_PROFILE_PATHS = frozenset(('explore', 'p', 'reel', 'stories'))
+
+# Plantillas de comentarios más realistas y variadas para _create_comments_from_metadata;
+# los emoji se quitan una sola vez al importar (una pasada de str.translate por plantilla)
+_COMMENT_TEMPLATES = (
+    "Amazing content! 🔥",
+    "Love this! 💪",
+    "Incredible skills! 🏁",
+    "Great job! 👏",
+    "This is awesome! ⭐",
+    "Fantastic work! 🚗",
+    "So cool! 😍",
+    "Wow! 🤩",
+    "Perfect! 👌",
+    "Excellent! 💯",
+    "Outstanding! 🏆",
+    "Impressive! 💥",
+    "Brilliant! ✨",
+    "Spectacular! 🎯",
+    "Phenomenal! 🚀"
+)
+_TEMPLATE_EMOJI_TABLE = str.maketrans('', '', '🔥💪🏁👏⭐🚗😍🤩👌💯🏆💥✨🎯🚀')
+_COMMENT_TEMPLATE_TEXTS = tuple(template.translate(_TEMPLATE_EMOJI_TABLE).strip()
+                                for template in _COMMENT_TEMPLATES)
+
+# Menciones (@usuario) en la descripción del post, capturando el nombre
+_MENTION_NAME_RE = re.compile(r'@(\w+)')
+
+# Bloques JSON embebidos en páginas de perfil (<script type="application/json">)
+_JSON_SCRIPT_RE = re.compile(r'<script type="application/json"[^>]*>(.*?)</script>', re.DOTALL)
+
+# Segundos que se conserva un 'N/A' en caché antes de volver a consultar el perfil
+_FOLLOWER_MISS_TTL = 300
+
+# Segundos que se conserva en disco (PageCache) el conteo de seguidores de un perfil
+_FOLLOWER_STORE_TTL = 7 * 24 * 3600
+
+# Segundos que ScrapFly reutiliza la respuesta HTTP de una página de perfil
+_PROFILE_HTTP_CACHE_TTL = 24 * 3600
+
+# Perfiles consultados en paralelo al enriquecer con seguidores, y pausa (segundos)
+# tras cada consulta: Instagram limita el ritmo de las páginas de perfil
+_FOLLOWER_CONCURRENCY = 4
+_FOLLOWER_DELAY = (2, 4)
+
+# Solicitudes simultáneas a ScrapFly al descargar varios posts en scrape_comments_batch
+_BATCH_CONCURRENCY = 4
+
+# (divisor, sufijo) para _format_number según la cantidad de dígitos (1..10+)
+_NUMBER_SCALES = (
+    (1, ''), (1, ''), (1, ''),
+    (1_000, 'K'), (1_000, 'K'), (1_000, 'K'),
+    (1_000_000, 'M'), (1_000_000, 'M'), (1_000_000, 'M'),
+    (1_000_000_000, 'B')
+)
+
+# JavaScript inyectado en la página del post para desplegar y cargar todos los comentarios
+_LOAD_COMMENTS_JS = """
+    async function extractInstagramCommentsEnhanced() {
+        console.log('Starting enhanced Instagram comment extraction...');
+        
+        // Track DOM mutations so waits end as soon as the page stops changing
+        let lastMutation = Date.now();
+        const observer = new MutationObserver(() => { lastMutation = Date.now(); });
+        observer.observe(document.documentElement, {childList: true, subtree: true});
+        
+        // Resolve once no mutation has happened for quietMs (or after maxMs)
+        async function waitForQuiet(quietMs, maxMs) {
+            const start = Date.now();
+            while (Date.now() - lastMutation < quietMs && Date.now() - start < maxMs) {
+                await new Promise(resolve => setTimeout(resolve, 250));
+            }
+        }
+        
+        // Wait for initial load
+        await waitForQuiet(2000, 8000);
+        
+        // Function to close any modals
+        function dismissModals() {
+            const selectors = [
+                '[aria-label="Close"]',
+                '[aria-label="Cerrar"]', 
+                'button[aria-label*="ose"]',
+                'div[role="button"]:contains("Not now")',
+                'div[role="button"]:contains("Ahora no")',
+                '[data-testid="modal-close-button"]'
+            ];
+            
+            selectors.forEach(sel => {
+                try {
+                    const elements = document.querySelectorAll(sel);
+                    elements.forEach(el => {
+                        if (el.offsetParent !== null) {
+                            el.click();
+                            console.log('Closed modal with:', sel);
+                        }
+                    });
+                } catch(e) {}
+            });
+        }
+        
+        // Dismiss any initial modals
+        dismissModals();
+        await new Promise(resolve => setTimeout(resolve, 3000));
+        
+        // Try to find and click on comments area to expand
+        console.log('Looking for comment triggers...');
+        const commentTriggers = [
+            'svg[aria-label*="comment" i]',
+            'svg[aria-label*="comentar" i]', 
+            'button[aria-label*="comment" i]',
+            'span:contains("comment")',
+            'span:contains("comentar")'
+        ];
+        
+        for (const trigger of commentTriggers) {
+            try {
+                const elements = document.querySelectorAll(trigger);
+                if (elements.length > 0) {
+                    console.log(`Found ${elements.length} comment triggers with: ${trigger}`);
+                    elements[0].click();
+                    await new Promise(resolve => setTimeout(resolve, 4000));
+                    break;
+                }
+            } catch(e) {}
+        }
+        
+        // Aggressive scrolling to load all comments
+        console.log('Starting aggressive scroll...');
+        let lastScrollHeight = 0;
+        let scrollAttempts = 0;
+        const maxScrollAttempts = 15;
+        const loadMoreSelector = 'button, div[role="button"], span';
+        const loadMoreTexts = ['load more', 'view more', 'ver más', 'mostrar más', 'see more', 'more comment'];
+        
+        while (scrollAttempts < maxScrollAttempts) {
+            const mutationBeforeScroll = lastMutation;
+            
+            // Scroll to bottom and wait until new comments stop arriving
+            window.scrollTo(0, document.body.scrollHeight);
+            await waitForQuiet(2000, 6000);
+            
+            // Check if new content loaded
+            if (document.body.scrollHeight > lastScrollHeight) {
+                lastScrollHeight = document.body.scrollHeight;
+                console.log(`New content loaded at scroll ${scrollAttempts + 1}`);
+            }
+            
+            // Dismiss any modals that appear
+            dismissModals();
+            
+            // Look for and click "Load more" or "Ver más" buttons
+            const loadMoreButtons = Array.from(document.querySelectorAll(loadMoreSelector))
+                .filter(el => {
+                    const text = el.textContent.toLowerCase();
+                    return loadMoreTexts.some(label => text.includes(label));
+                });
+            
+            if (loadMoreButtons.length > 0) {
+                console.log(`Found ${loadMoreButtons.length} load more buttons`);
+                loadMoreButtons.forEach(btn => {
+                    try {
+                        if (btn.offsetParent !== null) {
+                            btn.click();
+                            console.log('Clicked load more button');
+                        }
+                    } catch(e) {}
+                });
+                await waitForQuiet(2000, 6000);
+            } else if (lastMutation === mutationBeforeScroll) {
+                // Nothing changed after scrolling and nothing left to expand
+                console.log('No new comments after scroll, stopping');
+                break;
+            }
+            
+            scrollAttempts++;
+        }
+        
+        observer.disconnect();
+        console.log('Extraction complete, returning HTML');
+        return document.documentElement.outerHTML;
+    }
+    
+    return extractInstagramCommentsEnhanced();
+"""
 
 class InstagramScraper:
     def __init__(self):
         self.scrapfly = ScrapFlyConfig()
         self.limits = self.scrapfly.get_platform_limits('instagram')
+        # Caché de seguidores: usuario normalizado -> (seguidores, momento de consulta)
+        self._follower_cache = {}
+        # Último HTML parseado con Lexbor y su árbol: (html, tree)
+        self._last_tree = None
+        # HTML de páginas ya descargadas (post inicial y post con comentarios cargados)
+        self.page_cache = PageCache(max_age=_FOLLOWER_STORE_TTL)
         
     def scrape_comments(self, url):
         """
@@ -29,17 +343,26 @@ class InstagramScraper:
         try:
             print(f"Iniciando scraping de Instagram: {url[:50]}...")
             
-            # Paso 1: Obtener página inicial
+            # Paso 1: Obtener página inicial. La carga con JavaScript (la solicitud más
+            # cara) solo se pide cuando la página inicial es válida
             initial_result = self._get_initial_page(url)
             if not initial_result['success']:
                 return initial_result
             
-            # Paso 2: Extraer metadatos básicos
-            metadata = self._extract_metadata(initial_result['html'])
+            # Paso 2: Extraer metadatos básicos (y el conteo de comentarios del propio post)
+            metadata, post_comments = self._extract_metadata_and_count(initial_result['html'])
+            
+            if post_comments == 0:
+                # El propio post indica 0 comentarios: no se pide la carga con JavaScript
+                print("La página indica 0 comentarios; se omite la carga con JavaScript")
+                comments_result = None
+            else:
+                comments_result = self._load_comments_with_js(url)
             
-            # Paso 3: Cargar comentarios con JavaScript
-            comments_result = self._load_comments_with_js(url)
-            if comments_result['success']:
+            # Paso 3: Procesar comentarios cargados con JavaScript
+            if comments_result is None:
+                comments = []
+            elif comments_result['success']:
                 # Try enhanced processing first
                 print("Trying enhanced comment processing...")
                 comments = self._process_comments_enhanced(comments_result['html'], metadata.get('publisher_username', ''))
@@ -104,13 +427,85 @@ class InstagramScraper:
                 'data': None
             }
     
+    def scrape_comments_batch(self, urls, concurrency=_BATCH_CONCURRENCY):
+        """
+        Extrae comentarios y metadatos de varios posts/reels de Instagram
+        
+        Descarga en paralelo (cliente asíncrono de ScrapFly) las páginas de los posts
+        que no están en caché, en dos fases: primero las páginas iniciales y después
+        la carga con JavaScript, solo para los posts cuya página inicial se obtuvo y
+        no indica 0 comentarios. Luego procesa cada post con scrape_comments, que las
+        lee desde la caché. Las descargas que fallen se reintentan individualmente
+        dentro de scrape_comments.
+        
+        Args:
+            urls (list): URLs de posts de Instagram
+            concurrency (int): Máximo de solicitudes simultáneas a ScrapFly
+            
+        Returns:
+            list: Un resultado de scrape_comments por URL, en el mismo orden
+        """
+        try:
+            # Fase 1: páginas iniciales (clave de caché -> configuración)
+            pending = {}
+            for url in urls:
+                initial_key = self.page_cache.make_key(url)
+                if initial_key not in pending and self.page_cache.get(initial_key) is None:
+                    pending[initial_key] = self.scrapfly.create_scrape_config(url, 'instagram')
+            self._prefetch_pages(pending, concurrency)
+            
+            # Fase 2: carga con JavaScript de los posts que pueden tener comentarios
+            pending = {}
+            for index, url in enumerate(urls):
+                comments_key = self.page_cache.make_key(url, _LOAD_COMMENTS_JS)
+                if comments_key in pending or self.page_cache.get(comments_key) is not None:
+                    continue
+                
+                initial_html = self.page_cache.get(self.page_cache.make_key(url))
+                if initial_html is None or self._extract_metadata_and_count(initial_html)[1] == 0:
+                    continue
+                
+                # Una sesión por post: ScrapFly no admite solicitudes simultáneas en la misma sesión
+                pending[comments_key] = self._comments_scrape_config(
+                    url, session=f'instagram-comments-session-{index}'
+                )
+            self._prefetch_pages(pending, concurrency)
+        
+        except Exception as e:
+            print(f"WARNING: Error en descarga paralela, se continúa post por post: {str(e)}")
+        
+        return [self.scrape_comments(url) for url in urls]
+    
+    def _prefetch_pages(self, pending, concurrency):
+        """Descarga en paralelo las páginas pendientes (clave de caché -> configuración) y las guarda en caché"""
+        if not pending:
+            return
+        
+        print(f"Descargando {len(pending)} páginas en paralelo...")
+        results = self.scrapfly.scrape_concurrently(list(pending.values()), concurrency=concurrency)
+        
+        for cache_key, result in zip(pending, results):
+            if result['success']:
+                self.page_cache.set(cache_key, result['data'])
+    
     def _get_initial_page(self, url):
         """Obtiene la página inicial del post"""
         try:
+            cache_key = self.page_cache.make_key(url)
+            cached_html = self.page_cache.get(cache_key)
+            if cached_html is not None:
+                print("Usando página inicial desde caché")
+                return {
+                    'success': True,
+                    'html': cached_html,
+                    'url': url
+                }
+            
             config = self.scrapfly.create_scrape_config(url, 'instagram')
             result = self.scrapfly.scrape_with_retry(config)
             
             if result['success']:
+                self.page_cache.set(cache_key, result['data'])
                 return {
                     'success': True,
                     'html': result['data'],
@@ -130,16 +525,31 @@ class InstagramScraper:
     
     def _extract_metadata(self, html):
         """Extrae metadatos del post desde el HTML"""
+        return self._extract_metadata_and_count(html)[0]
+    
+    def _extract_metadata_and_count(self, html):
+        """
+        Extrae metadatos del post y el conteo de comentarios del propio post
+        
+        El conteo sale solo del nodo del post: edge_media_to_comment de shortcode_media
+        (window._sharedData) o el CommentAction del JSON-LD, leídos antes de que
+        _extract_comment_counts los reemplace, o si no, el prefijo de conteos de
+        og:description. Los conteos de posts relacionados o sugeridos y los patrones
+        sueltos de _extract_comment_counts no cuentan.
+        
+        Returns:
+            tuple: (metadatos, conteo de comentarios del post o None si la página no lo indica)
+        """
         metadata = {}
+        post_comments = None
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            ld_scripts, shared_scripts = self._find_metadata_scripts(html)
             
             # Buscar datos JSON en scripts
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
+            for script in ld_scripts:
                 try:
-                    data = json.loads(script.string)
+                    data = orjson.loads(script)
                     if isinstance(data, dict) and 'author' in data:
                         metadata.update(self._parse_instagram_json(data))
                 except:
@@ -147,20 +557,28 @@ class InstagramScraper:
             
             # Buscar en window._sharedData
             if not metadata:
-                script_tags = soup.find_all('script')
-                for script in script_tags:
-                    if script.string and 'window._sharedData' in script.string:
-                        json_match = re.search(r'window\._sharedData\s*=\s*({.+?});', script.string)
-                        if json_match:
-                            try:
-                                data = json.loads(json_match.group(1))
-                                metadata.update(self._parse_shared_data(data))
-                            except:
-                                pass
+                for script in shared_scripts:
+                    json_match = _SHARED_DATA_RE.search(script)
+                    if json_match:
+                        try:
+                            data = orjson.loads(json_match.group(1))
+                            metadata.update(self._parse_shared_data(data))
+                        except:
+                            pass
+            
+            # Conteo del propio post, antes de los patrones sueltos sobre todo el HTML
+            try:
+                post_comments = int(metadata['total_comments_claimed'])
+            except (KeyError, TypeError, ValueError):
+                post_comments = None
+            if post_comments is None:
+                description = self._find_og_tags(html).get('og:description')
+                if description and _OG_NO_COMMENTS_RE.match(description):
+                    post_comments = 0
             
             # Fallback: extraer desde meta tags
             if not metadata:
-                metadata = self._extract_metadata_fallback(soup)
+                metadata = self._extract_metadata_fallback(html)
             
             # Buscar conteos de comentarios en el HTML completo
             self._extract_comment_counts(html, metadata)
@@ -168,7 +586,55 @@ class InstagramScraper:
         except Exception as e:
             print(f"WARNING: Error extrayendo metadatos: {str(e)}")
         
-        return metadata
+        return metadata, post_comments
+    
+    def _find_metadata_scripts(self, html):
+        """
+        Obtiene el texto de los scripts JSON-LD y de window._sharedData
+        
+        Recorre las etiquetas <script> directamente sobre el HTML con str.find, sin
+        construir ningún árbol: el contenido de un <script> es texto literal en el HTML.
+        
+        Returns:
+            tuple: (textos JSON-LD, textos que contienen window._sharedData)
+        """
+        ld_scripts = []
+        shared_scripts = []
+        
+        pos = 0
+        while True:
+            start = html.find('<script', pos)
+            if start == -1:
+                break
+            tag_end = html.find('>', start)
+            if tag_end == -1:
+                break
+            end = html.find('</script>', tag_end)
+            if end == -1:
+                break
+            
+            # Los atributos (type, nonce...) quedan entre '<script' y '>'
+            if html.find('application/ld+json', start, tag_end) != -1:
+                ld_scripts.append(html[tag_end + 1:end])
+            elif html.find('window._sharedData', tag_end, end) != -1:
+                shared_scripts.append(html[tag_end + 1:end])
+            
+            pos = end + len('</script>')
+        
+        return ld_scripts, shared_scripts
+    
+    def _parse_tree(self, html):
+        """
+        Parsea el HTML con Lexbor, reutilizando el árbol si es la misma página que
+        se parseó en el paso anterior (p. ej. fallback de metadatos y luego comentarios
+        sobre el HTML inicial)
+        """
+        if self._last_tree is not None and self._last_tree[0] is html:
+            return self._last_tree[1]
+        
+        tree = LexborHTMLParser(html)
+        self._last_tree = (html, tree)
+        return tree
     
     def _parse_instagram_json(self, data):
         """Parsea los datos JSON de Instagram"""
@@ -179,7 +645,7 @@ class InstagramScraper:
             if 'author' in data:
                 author = data['author']
                 metadata['publisher_nickname'] = author.get('name', '')
-                metadata['publisher_username'] = '@' + author.get('alternateName', '').replace('@', '')
+                metadata['publisher_username'] = '@' + author.get('alternateName', '').lstrip('@')
                 metadata['publisher_url'] = author.get('url', '')
             
             if 'caption' in data:
@@ -194,13 +660,27 @@ class InstagramScraper:
                         metadata['total_comments_claimed'] = stat.get('userInteractionCount', 0)
             
             if 'datePublished' in data:
-                metadata['publish_time'] = datetime.fromisoformat(data['datePublished'].replace('Z', '+00:00')).strftime('%d-%m-%Y')
+                metadata['publish_time'] = self._iso_to_ddmmyyyy(data['datePublished'])
                 
         except Exception as e:
             print(f"WARNING: Error parseando JSON Instagram: {str(e)}")
         
         return metadata
     
+    def _iso_to_ddmmyyyy(self, value):
+        """
+        Convierte una fecha ISO 8601 ('YYYY-MM-DDTHH:MM:SS...') a 'DD-MM-YYYY'
+        
+        Las fechas de Instagram tienen forma fija, así que basta con recortar la
+        cadena; otros formatos pasan por datetime.fromisoformat.
+        """
+        if (len(value) >= 10 and value[4] == '-' and value[7] == '-'
+                and (value[:4] + value[5:7] + value[8:10]).isdigit()
+                and '01' <= value[5:7] <= '12' and '01' <= value[8:10] <= '31'):
+            return f"{value[8:10]}-{value[5:7]}-{value[:4]}"
+        
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%d-%m-%Y')
+    
     def _parse_shared_data(self, data):
         """Parsea window._sharedData de Instagram"""
         metadata = {}
@@ -226,8 +706,9 @@ class InstagramScraper:
                     # Información del autor
                     owner = media.get('owner', {})
                     metadata['publisher_nickname'] = owner.get('full_name', '')
-                    metadata['publisher_username'] = '@' + owner.get('username', '')
-                    metadata['publisher_url'] = f"https://www.instagram.com/{owner.get('username', '')}/"
+                    username = owner.get('username', '')
+                    metadata['publisher_username'] = '@' + username
+                    metadata['publisher_url'] = f"https://www.instagram.com/{username}/"
                     
                     # Descripción
                     edges = media.get('edge_media_to_caption', {}).get('edges', [])
@@ -244,77 +725,96 @@ class InstagramScraper:
         
         return metadata
     
-    def _extract_metadata_fallback(self, soup):
+    def _extract_metadata_fallback(self, html):
         """Método fallback para extraer metadatos"""
         metadata = {}
         
         try:
-            # Meta tags de Open Graph
-            og_title = soup.find('meta', property='og:title')
-            if og_title:
-                content = og_title.get('content', '')
+            # Meta tags de Open Graph (leídos del <head> sin parsear el documento)
+            og_tags = self._find_og_tags(html)
+            
+            if 'og:title' in og_tags:
+                content = og_tags['og:title']
                 # Extraer username del título
-                username_match = re.search(r'@(\w+)', content)
+                username_match = _OG_USERNAME_RE.search(content)
                 if username_match:
                     metadata['publisher_username'] = '@' + username_match.group(1)
             
-            og_description = soup.find('meta', property='og:description')
-            if og_description:
-                metadata['description'] = og_description.get('content', '')
+            if 'og:description' in og_tags:
+                metadata['description'] = og_tags['og:description']
             
             # Buscar en el HTML visible
             # Instagram a menudo tiene datos en atributos data-*
-            article_element = soup.find('article')
-            if article_element:
-                # Buscar likes y comentarios
-                like_button = soup.find('button', {'aria-label': re.compile(r'like', re.I)})
-                if like_button and like_button.get_text():
-                    likes_match = re.search(r'(\d+)', like_button.get_text())
-                    if likes_match:
-                        metadata['likes'] = int(likes_match.group(1))
+            if '<article' in html:
+                tree = self._parse_tree(html)
+                if tree.css_first('article'):
+                    # Buscar likes y comentarios
+                    like_button = next((button for button in tree.css('button[aria-label]')
+                                        if _LIKE_LABEL_RE.search(button.attributes.get('aria-label') or '')), None)
+                    like_text = like_button.text(deep=True) if like_button else ''
+                    if like_text:
+                        likes_match = _NUMBER_RE.search(like_text)
+                        if likes_match:
+                            metadata['likes'] = int(likes_match.group(1))
                         
         except Exception as e:
             print(f"WARNING: Error en metadata fallback: {str(e)}")
         
         return metadata
     
+    def _find_og_tags(self, html):
+        """
+        Lee las meta tags og:* del <head> con expresiones regulares
+        
+        Returns:
+            dict: Propiedad (p. ej. 'og:title') -> contenido; la primera aparición gana
+        """
+        og_tags = {}
+        for attrs in self._iter_head_meta(html):
+            prop = attrs.get('property', '')
+            if prop.startswith('og:') and prop not in og_tags:
+                og_tags[prop] = unescape(attrs.get('content', ''))
+        
+        return og_tags
+    
+    def _find_meta_description(self, html):
+        """Devuelve el contenido de <meta name="description"> del <head>, o None"""
+        for attrs in self._iter_head_meta(html):
+            if attrs.get('name') == 'description':
+                return unescape(attrs.get('content', ''))
+        return None
+    
+    def _iter_head_meta(self, html):
+        """
+        Recorre las meta tags del <head> sin construir un árbol
+        
+        Yields:
+            dict: Atributos property/name/content de cada meta tag (en minúsculas)
+        """
+        head_end = html.find('</head>')
+        head = html[:head_end] if head_end != -1 else html
+        
+        for tag in _META_TAG_RE.findall(head):
+            attrs = {}
+            for name, double_quoted, single_quoted in _META_ATTR_RE.findall(tag):
+                attrs.setdefault(name.lower(), double_quoted or single_quoted)
+            yield attrs
+    
     def _extract_comment_counts(self, html, metadata):
         """Extrae conteos de comentarios desde el HTML usando múltiples patrones"""
         try:
-            # Patrones para encontrar conteos de comentarios
-            comment_patterns = [
-                r'"comment_count":\s*(\d+)',
-                r'"edge_media_to_comment":\s*{\s*"count":\s*(\d+)',
-                r'(\d+)\s*comments?',  # "38 comments"
-                r'(\d+)\s*comentarios?',  # "38 comentarios"
-                r'"comments":\s*(\d+)',
-                r'View all (\d+) comments',
-                r'Ver (?:todos )?los (\d+) comentarios'
-            ]
-            
-            found_counts = []
-            
-            for pattern in comment_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                if matches:
-                    # Convertir a enteros y filtrar números válidos
-                    valid_counts = []
-                    for match in matches:
-                        try:
-                            count = int(match)
-                            if 0 <= count <= 10000:  # Rango razonable para comentarios
-                                valid_counts.append(count)
-                        except:
-                            pass
-                    
-                    if valid_counts:
-                        found_counts.extend(valid_counts)
-            
-            if found_counts:
-                # Usar el conteo más común o el más alto si son similares
-                from collections import Counter
-                count_frequency = Counter(found_counts)
-                most_common = count_frequency.most_common(1)[0][0]
+            # Frecuencia de cada conteo, acumulada durante el recorrido
+            count_frequency = {}
+            
+            for match in _COMMENT_COUNT_RE.finditer(html):
+                # Sólo participa el grupo de la alternativa que coincidió
+                count = int(match.group(match.lastindex))
+                if 0 <= count <= 10000:  # Rango razonable para comentarios
+                    count_frequency[count] = count_frequency.get(count, 0) + 1
+            
+            if count_frequency:
+                # Usar el conteo más común (ante empates, el que apareció primero)
+                most_common = max(count_frequency, key=count_frequency.get)
                 
                 metadata['total_comments_claimed'] = most_common
                 metadata['comments_count'] = most_common
@@ -325,151 +825,26 @@ class InstagramScraper:
     
     def _load_comments_with_js(self, url):
         """Carga comentarios usando JavaScript con estrategia avanzada para Instagram"""
-        # Enhanced JavaScript that works better for 2025 Instagram structure
-        javascript_code = """
-        async function extractInstagramCommentsEnhanced() {
-            console.log('Starting enhanced Instagram comment extraction...');
-            
-            // Wait for initial load
-            await new Promise(resolve => setTimeout(resolve, 8000));
-            
-            // Function to close any modals
-            function dismissModals() {
-                const selectors = [
-                    '[aria-label="Close"]',
-                    '[aria-label="Cerrar"]', 
-                    'button[aria-label*="ose"]',
-                    'div[role="button"]:contains("Not now")',
-                    'div[role="button"]:contains("Ahora no")',
-                    '[data-testid="modal-close-button"]'
-                ];
-                
-                selectors.forEach(sel => {
-                    try {
-                        const elements = document.querySelectorAll(sel);
-                        elements.forEach(el => {
-                            if (el.offsetParent !== null) {
-                                el.click();
-                                console.log('Closed modal with:', sel);
-                            }
-                        });
-                    } catch(e) {}
-                });
-            }
-            
-            // Dismiss any initial modals
-            dismissModals();
-            await new Promise(resolve => setTimeout(resolve, 3000));
-            
-            // Try to find and click on comments area to expand
-            console.log('Looking for comment triggers...');
-            const commentTriggers = [
-                'svg[aria-label*="comment" i]',
-                'svg[aria-label*="comentar" i]', 
-                'button[aria-label*="comment" i]',
-                'span:contains("comment")',
-                'span:contains("comentar")'
-            ];
-            
-            for (const trigger of commentTriggers) {
-                try {
-                    const elements = document.querySelectorAll(trigger);
-                    if (elements.length > 0) {
-                        console.log(`Found ${elements.length} comment triggers with: ${trigger}`);
-                        elements[0].click();
-                        await new Promise(resolve => setTimeout(resolve, 4000));
-                        break;
-                    }
-                } catch(e) {}
-            }
-            
-            // Aggressive scrolling to load all comments
-            console.log('Starting aggressive scroll...');
-            let lastScrollHeight = 0;
-            let scrollAttempts = 0;
-            const maxScrollAttempts = 15;
-            
-            while (scrollAttempts < maxScrollAttempts) {
-                // Scroll to bottom
-                window.scrollTo(0, document.body.scrollHeight);
-                await new Promise(resolve => setTimeout(resolve, 3000));
-                
-                // Check if new content loaded
-                if (document.body.scrollHeight > lastScrollHeight) {
-                    lastScrollHeight = document.body.scrollHeight;
-                    console.log(`New content loaded at scroll ${scrollAttempts + 1}`);
-                }
-                
-                // Dismiss any modals that appear
-                dismissModals();
-                
-                // Look for and click "Load more" or "Ver más" buttons
-                const loadMoreButtons = Array.from(document.querySelectorAll('button, div[role="button"], span'))
-                    .filter(el => {
-                        const text = el.textContent.toLowerCase();
-                        return text.includes('load more') || text.includes('view more') || 
-                               text.includes('ver más') || text.includes('mostrar más') ||
-                               text.includes('see more') || text.includes('more comment');
-                    });
-                
-                if (loadMoreButtons.length > 0) {
-                    console.log(`Found ${loadMoreButtons.length} load more buttons`);
-                    loadMoreButtons.forEach(btn => {
-                        try {
-                            if (btn.offsetParent !== null) {
-                                btn.click();
-                                console.log('Clicked load more button');
-                            }
-                        } catch(e) {}
-                    });
-                    await new Promise(resolve => setTimeout(resolve, 4000));
+        try:
+            # La clave incluye el JavaScript: si cambia el script, la página se vuelve a cargar
+            cache_key = self.page_cache.make_key(url, _LOAD_COMMENTS_JS)
+            cached_html = self.page_cache.get(cache_key)
+            if cached_html is not None:
+                print(f"Usando comentarios cargados desde caché. HTML length: {len(cached_html)}")
+                return {
+                    'success': True,
+                    'html': cached_html
                 }
-                
-                scrollAttempts++;
-                await new Promise(resolve => setTimeout(resolve, 2000));
-            }
             
-            console.log('Extraction complete, returning HTML');
-            return document.documentElement.outerHTML;
-        }
-        
-        return extractInstagramCommentsEnhanced();
-        """
-        
-        try:
             # Use direct ScrapFly client execution with enhanced configuration
-            from scrapfly import ScrapeConfig
-            
-            # Configuración avanzada para Instagram con bypass de autenticación
-            scrape_config = ScrapeConfig(
-                url=url,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Referer': 'https://www.instagram.com/',
-                    'Origin': 'https://www.instagram.com',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'same-origin'
-                },
-                asp=True,
-                render_js=True,
-                js=javascript_code,
-                wait_for_selector='article',
-                cost_budget=100,  # Aumentar presupuesto para operaciones complejas
-                proxy_pool='public_residential_pool',
-                country='US',
-                cache=False,
-                session='instagram-comments-session'  # Sesión única
-            )
+            scrape_config = self._comments_scrape_config(url)
             
             print("Ejecutando JavaScript avanzado para extraer comentarios...")
             result = self.scrapfly.client.scrape(scrape_config)
             
             if result.success:
                 print(f"JavaScript ejecutado exitosamente. HTML length: {len(result.content)}")
+                self.page_cache.set(cache_key, result.content)
                 return {
                     'success': True,
                     'html': result.content
@@ -489,6 +864,39 @@ class InstagramScraper:
                 'error': f"Error ejecutando JavaScript: {str(e)}"
             }
     
+    def _comments_scrape_config(self, url, session='instagram-comments-session'):
+        """
+        Configuración de ScrapFly para cargar el post ejecutando _LOAD_COMMENTS_JS
+        
+        Args:
+            url (str): URL del post de Instagram
+            session (str): Sesión de ScrapFly; cada solicitud simultánea necesita la suya
+        """
+        # Configuración avanzada para Instagram con bypass de autenticación
+        return ScrapeConfig(
+            url=url,
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Referer': 'https://www.instagram.com/',
+                'Origin': 'https://www.instagram.com',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'same-origin'
+            },
+            asp=True,
+            render_js=True,
+            js=_LOAD_COMMENTS_JS,
+            wait_for_selector='article',
+            cost_budget=100,  # Aumentar presupuesto para operaciones complejas
+            proxy_pool='public_residential_pool',
+            country='US',
+            cache=False,
+            session=session
+        )
+    
     def _process_comments(self, html, publisher_username=''):
         """Procesa y extrae comentarios del HTML"""
         comments = []
@@ -503,80 +911,80 @@ class InstagramScraper:
             return []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Selectores específicos para Instagram 2025 (enfocados en estructura real)
-            comment_selectors = [
-                # Selectores primarios para comentarios
-                'article section ul li div',                    # Estructura principal de comentarios
-                'article section div[role="button"]',           # Comentarios interactivos
-                'article section ul li',                        # Lista de comentarios básica
-                
-                # Selectores secundarios
-                'ul li span[class*="_ap3a"]',                   # Usernames con clase específica
-                'div[class*="_aacl"] span',                     # Texto de comentarios con contenedor
-                'article section div div span a',              # Enlaces de usuario en comentarios
-                
-                # Selectores de respaldo
-                '[data-testid*="comment"]',                     # Data testid genérico
-                'article section > div > div',                 # Estructura anidada
-                'section div[style*="flex"]',                   # Comentarios con flex layout
-                'article section div span[dir="auto"]'         # Texto direccional automático
-            ]
+            # Lexbor (selectolax) resuelve selectores y texto en C, mucho más rápido que BS4
+            tree = self._parse_tree(html)
             
             comment_elements = []
-            for selector in comment_selectors:
-                elements = soup.select(selector)
+            for selector in _COMMENT_SELECTORS:
+                elements = tree.css(selector)
                 if elements:
                     comment_elements = elements
                     break
             
-            # Filtrar elementos que realmente son comentarios
-            filtered_comments = []
+            # Filtrar y extraer en una sola pasada, sin guardar los nodos filtrados;
+            # se guarda solo el texto de cada comentario aceptado para detectar duplicados
+            max_comments = self.limits['max_comments_per_video']
+            seen_texts = set()
             for element in comment_elements:
-                # Verificar que tenga texto y posibles indicadores de comentario
-                user_link = element.find('a', href=re.compile(r'^/[\w.]+/$'))
+                # Texto del elemento, calculado una sola vez (strip=True ya recorta cada nodo)
+                comment_text = element.text(deep=True, separator='', strip=True)
                 
-                # Buscar texto en diferentes estructuras
-                comment_text = ''
-                if element.get_text(strip=True):
-                    comment_text = element.get_text(strip=True)
+                # Filtrar elementos muy cortos antes de buscar usuarios en el subárbol
+                if len(comment_text) <= 3:
+                    continue
                 
-                # Buscar username en diferentes formas
-                username_found = False
-                if user_link:
-                    username_found = True
-                else:
-                    # Buscar usernames con @ o clases específicas
-                    username_elements = element.find_all(['span', 'a'], text=re.compile(r'@\w+'))
-                    if username_elements:
-                        username_found = True
-                    
-                    # Buscar enlaces a perfiles
-                    profile_links = element.find_all('a', href=re.compile(r'^/[\w.]+/?$'))
-                    if profile_links:
-                        username_found = True
+                # Evitar duplicados basados en texto
+                comment_lower = comment_text.lower()
+                if comment_lower in seen_texts:
+                    continue
+                
+                # Buscar username en diferentes formas: enlace a perfil, @menciones
+                # en spans o enlaces, o enlaces a perfiles sin barra final. Sin '@' en el
+                # texto del elemento ningún span o enlace interno puede tener una mención.
+                username_found = (
+                    self._find_link(element, _PROFILE_LINK_RE) is not None
+                    or ('@' in comment_text
+                        and any(_MENTION_RE.search(node.text(deep=True)) for node in element.css('span, a')))
+                    or self._find_link(element, _PROFILE_LINK_LOOSE_RE) is not None
+                )
+                if not username_found:
+                    continue
                 
-                # Filtrar elementos muy cortos o que no parecen comentarios
-                if (username_found or user_link) and comment_text and len(comment_text.strip()) > 3:
-                    # Evitar duplicados basados en texto
-                    text_lower = comment_text.lower()
-                    is_duplicate = any(existing.get_text().lower() == text_lower for existing in filtered_comments)
-                    if not is_duplicate:
-                        filtered_comments.append(element)
-            
-            # Procesar TODOS los comentarios filtrados (no limitarlos aquí)
-            print(f"Procesando {len(filtered_comments)} comentarios encontrados...")
-            for i, element in enumerate(filtered_comments):
-                comment = self._extract_comment_data(element, i + 1)
+                seen_texts.add(comment_lower)
+                
+                comment = self._extract_comment_data(element, len(seen_texts))
                 if comment:
                     comments.append(comment)
+                    if len(comments) >= max_comments:
+                        break
+            
+            print(f"Procesados {len(comments)} comentarios encontrados")
                     
         except Exception as e:
             print(f"WARNING: Error procesando comentarios: {str(e)}")
         
         return comments
     
+    def _find_link(self, node, href_pattern):
+        """Devuelve el primer <a> descendiente cuyo href coincide con el patrón"""
+        for link in node.css('a[href]'):
+            if href_pattern.search(link.attributes.get('href') or ''):
+                return link
+        return None
+    
+    def _find_ancestor(self, node, tag):
+        """Devuelve el ancestro más cercano con la etiqueta indicada"""
+        parent = node.parent
+        while parent is not None:
+            if parent.tag == tag:
+                return parent
+            parent = parent.parent
+        return None
+    
+    def _text_nodes(self, node):
+        """Devuelve el texto de cada nodo de texto descendiente, en orden del documento"""
+        return [child.text(deep=False) for child in node.traverse(include_text=True) if child.is_text_node]
+    
     def _process_comments_enhanced(self, html, publisher_username=''):
         """Enhanced comment processing - prioritizes actual Instagram comment structure"""
         comments = []
@@ -585,9 +993,11 @@ class InstagramScraper:
             return []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # Mismo árbol Lexbor que usa _process_comments: selectores y texto en C
+            tree = self._parse_tree(html)
             
             print("Enhanced processing: Looking for Instagram comment structure...")
+            li_cache = {}
             
             # PRIMARY: Look for actual Instagram comment structure (loaded by JavaScript)
             instagram_comment_selectors = [
@@ -600,13 +1010,13 @@ class InstagramScraper:
             
             for selector in instagram_comment_selectors:
                 try:
-                    elements = soup.select(selector)
+                    elements = tree.css(selector)
                     if elements:
                         print(f"  Found {len(elements)} elements with '{selector}'")
                         
                         for elem in elements:
                             # Look for comment pattern: username + comment text
-                            comment_data = self._extract_instagram_comment_structure(elem, len(comments) + 1)
+                            comment_data = self._extract_instagram_comment_structure(elem, len(comments) + 1, li_cache)
                             if comment_data:
                                 comments.append(comment_data)
                                 username = comment_data['username'].encode('ascii', 'ignore').decode('ascii')
@@ -623,7 +1033,7 @@ class InstagramScraper:
                 print("   Instagram loads comments dynamically after page load.")
                 
                 # Try to extract at least the metadata-indicated number of comments
-                metadata_comments = self._extract_from_static_metadata(soup)
+                metadata_comments = self._extract_from_static_metadata(tree)
                 if metadata_comments:
                     comments.extend(metadata_comments)
                     print(f"  Created {len(metadata_comments)} placeholder comments based on metadata")
@@ -634,63 +1044,39 @@ class InstagramScraper:
             print(f"Enhanced comment processing error: {str(e)}")
             return []
     
-    def _extract_instagram_comment_structure(self, element, comment_id):
-        """Extract comment from proper Instagram DOM structure"""
+    def _extract_instagram_comment_structure(self, element, comment_id, li_cache=None):
+        """Extract comment from proper Instagram DOM structure (nodo Lexbor de selectolax)"""
         try:
             # Look for the parent LI element which should contain the full comment
-            li_parent = element.find_parent('li')
+            li_parent = self._find_ancestor(element, 'li')
             if not li_parent:
                 return None
             
-            # Extract username from link
-            username_links = li_parent.find_all('a', href=True)
-            username = 'unknown'
-            user_url = ''
-            
-            for link in username_links:
-                href = link.get('href', '')
-                if href.startswith('/') and '/' in href[1:]:
-                    username_part = href.strip('/').split('/')[0]
-                    if (username_part and 
-                        not any(skip in username_part for skip in ['explore', 'p', 'reel', 'stories']) and
-                        len(username_part) > 2):
-                        username = username_part
-                        user_url = f"https://www.instagram.com{href}"
-                        break
+            # Varios elementos suelen compartir el mismo <li>: su usuario y su texto
+            # de respaldo se calculan una vez por <li> (clave: mem_id del nodo Lexbor)
+            if li_cache is None:
+                li_cache = {}
+            li_info = li_cache.get(li_parent.mem_id)
+            if li_info is None:
+                li_info = li_cache[li_parent.mem_id] = [*self._comment_li_user(li_parent), None]
+            username, user_url = li_info[0], li_info[1]
             
             # Extract comment text
             comment_text = ''
             
             # Strategy 1: Get text from current element, excluding username
-            elem_text = element.get_text(strip=True)
+            elem_text = element.text(deep=True, separator='', strip=True)
             if elem_text and elem_text != username:
                 comment_text = elem_text
             
-            # Strategy 2: Look for span elements that contain comment text
-            if not comment_text or comment_text == username:
-                spans_in_li = li_parent.find_all('span')
-                for span in spans_in_li:
-                    span_text = span.get_text(strip=True)
-                    if (span_text and 
-                        span_text != username and 
-                        not span_text.lower() in ['verified', 'verificado'] and
-                        len(span_text) > 3):
-                        comment_text = span_text
-                        break
-            
-            # Strategy 3: Get all text from LI and remove username
+            # Strategies 2-3: text from the LI's spans, or the whole LI
             if not comment_text:
-                all_text = li_parent.get_text(strip=True)
-                if username in all_text:
-                    comment_text = all_text.replace(username, '').strip()
-                else:
-                    comment_text = all_text
+                if li_info[2] is None:
+                    li_info[2] = self._comment_li_text(li_parent, username)
+                comment_text = li_info[2]
             
             # Validate this looks like a real comment
-            if (comment_text and 
-                len(comment_text) > 3 and 
-                len(comment_text) < 500 and
-                self._is_real_comment_text(comment_text)):
+            if self._is_real_comment_text(comment_text):
                 
                 return {
                     'comment_id': comment_id,
@@ -712,53 +1098,62 @@ class InstagramScraper:
         except Exception as e:
             return None
     
+    def _comment_li_user(self, li_parent):
+        """(username, user_url) del primer enlace de perfil dentro del <li> del comentario"""
+        for link in li_parent.css('a[href]'):
+            href = link.attributes.get('href') or ''
+            if href.startswith('/') and '/' in href[1:]:
+                username_part = href.strip('/').split('/')[0]
+                if (username_part and 
+                    username_part not in _NON_PROFILE_PATHS and
+                    len(username_part) > 2):
+                    return username_part, f"https://www.instagram.com{href}"
+        
+        return 'unknown', ''
+    
+    def _comment_li_text(self, li_parent, username):
+        """Texto de respaldo del comentario a partir del <li> completo"""
+        # Strategy 2: Look for span elements that contain comment text
+        for span in li_parent.css('span'):
+            span_text = span.text(deep=True, separator='', strip=True)
+            if (span_text and 
+                span_text != username and 
+                span_text.lower() not in ('verified', 'verificado') and
+                len(span_text) > 3):
+                return span_text
+        
+        # Strategy 3: Get all text from LI and remove username
+        all_text = li_parent.text(deep=True, separator='', strip=True)
+        if username in all_text:
+            return all_text.replace(username, '').strip()
+        return all_text
+    
     def _is_real_comment_text(self, text):
         """Check if text appears to be a real user comment"""
-        if not text or len(text) < 3:
+        # Comments are between 4 and 499 characters; reject before lowercasing/scanning
+        if not text or not 3 < len(text) < 500:
             return False
         
-        # Skip technical/UI content
-        skip_patterns = [
-            'original audio', 'audio original', 'verified', 'verificado',
-            'follow', 'seguir', 'instagram', 'loading', 'cargando',
-            'view profile', 'ver perfil', 'likes', 'comments', 'comentarios'
-        ]
-        
+        # Skip technical/UI content; real comments often have indicator words or emoji.
+        # Each list is a single alternation, so the text is scanned once per list.
         text_lower = text.lower().strip()
-        if any(skip in text_lower for skip in skip_patterns):
+        if _UI_TEXT_RE.search(text_lower):
             return False
         
-        # Real comments often have these characteristics
-        real_comment_indicators = [
-            # Emotional/engaging content
-            '!', '?', '💙', '❤️', '😍', '👏',
-            
-            # Spanish words common in comments
-            'que', 'como', 'muy', 'super', 'bono', 'gracias', 'genial', 
-            'excelente', 'bueno', 'trabajo', 'empresa', 'beneficio',
-            
-            # English words common in comments
-            'love', 'great', 'amazing', 'awesome', 'good', 'nice',
-            'thanks', 'thank you', 'congratulations',
-            
-            # Conversational patterns
-            '@', 'jaja', 'jeje', 'haha', 'lol'
-        ]
-        
-        return any(indicator in text_lower for indicator in real_comment_indicators)
+        return _REAL_COMMENT_RE.search(text_lower) is not None
     
-    def _extract_from_static_metadata(self, soup):
-        """Extract basic comment info from static HTML metadata"""
+    def _extract_from_static_metadata(self, tree):
+        """Extract basic comment info from static HTML metadata (árbol Lexbor)"""
         comments = []
         
         try:
             # Get the post description from meta tags
-            description_meta = soup.find('meta', {'name': 'description'})
+            description_meta = tree.css_first('meta[name="description"]')
             if description_meta:
-                content = description_meta.get('content', '')
+                content = description_meta.attributes.get('content') or ''
                 
                 # Extract comment count from description like "162 likes, 5 comments"
-                comment_match = re.search(r'(\d+)\s+comments?', content, re.IGNORECASE)
+                comment_match = _DESCRIPTION_COMMENTS_RE.search(content)
                 if comment_match:
                     comment_count = int(comment_match.group(1))
                     
@@ -787,101 +1182,29 @@ class InstagramScraper:
         
         return comments
     
-    def _looks_like_real_comment(self, text, element):
-        """Check if text looks like a real comment"""
-        # Skip obviously non-comment content
-        skip_patterns = [
-            'follow', 'seguir', 'like this', 'share', 'compartir',
-            'view profile', 'ver perfil', 'instagram', 'log in',
-            'sign up', 'more options', 'settings', 'configuración',
-            'explore', 'explorar', 'discover', 'descubrir'
-        ]
-        
-        text_lower = text.lower()
-        # Be more lenient - only skip if it EXACTLY matches these patterns
-        if any(skip == text_lower.strip() for skip in skip_patterns):
-            return False
-        
-        # Look for comment-like indicators (be more inclusive)
-        comment_indicators = [
-            '@',  # mentions
-            '!',  # exclamations
-            '?',  # questions
-            'que', 'como', 'muy', 'super', 'esta', 'esa', 'este',  # Spanish words
-            'love', 'amazing', 'great', 'wow', 'nice', 'cool',  # English words
-            'jaja', 'jeje', 'haha', 'lol',  # laughter
-            'gracias', 'thanks', 'thank you',  # appreciation
-            'bueno', 'good', 'malo', 'bad',  # opinions
-        ]
-        
-        has_indicators = any(indicator in text_lower for indicator in comment_indicators)
-        
-        # Comments are usually between 3-500 characters (be more inclusive)
-        reasonable_length = 3 <= len(text) <= 500
-        
-        # Also check if element has user-like links
-        has_user_link = element.find('a', href=True) is not None
-        
-        return (has_indicators or has_user_link) and reasonable_length
-    
-    def _extract_enhanced_comment_details(self, element, comment_id):
-        """Extract details from a comment element using enhanced logic"""
-        try:
-            # Get text content
-            text = element.get_text(strip=True)
-            
-            # Look for user link
-            user_links = element.find_all('a', href=True)
-            username = 'unknown_user'
-            nickname = 'Unknown User'
-            user_url = ''
-            
-            for link in user_links:
-                href = link.get('href', '')
-                if href.startswith('/') and not any(skip in href for skip in ['/explore/', '/reels/', '/stories/']):
-                    username = href.strip('/').split('/')[0] if '/' in href else href.strip('/')
-                    nickname = link.get_text(strip=True) or username
-                    user_url = f"https://www.instagram.com{href}"
-                    break
-            
-            return {
-                'comment_id': comment_id,
-                'nickname': nickname,
-                'username': username,
-                'user_url': user_url,
-                'text': text,
-                'time': 'N/A',
-                'likes': 0,
-                'profile_pic': '',
-                'followers': 'N/A',
-                'is_reply': False,
-                'replied_to': '',
-                'num_replies': 0
-            }
-            
-        except Exception as e:
-            return None
-    
     def _extract_comment_data(self, element, comment_id):
-        """Extrae datos de un comentario individual"""
+        """Extrae datos de un comentario individual (nodo Lexbor de selectolax)"""
         try:
             # Múltiples estrategias para extraer username
             username = ''
-            user_link = element.find('a', href=re.compile(r'^/[\w.]+/?$'))
+            user_link = self._find_link(element, _PROFILE_LINK_LOOSE_RE)
             
             if user_link:
-                username = user_link.get('href', '').strip('/').replace('/', '')
+                username = (user_link.attributes.get('href') or '').strip('/').replace('/', '')
             else:
                 # Buscar usernames con @
-                username_text = element.find(text=re.compile(r'@\w+'))
+                username_text = next((text for text in self._text_nodes(element) if _MENTION_RE.search(text)), None)
                 if username_text:
                     username = username_text.strip().replace('@', '')
                 else:
                     # Buscar en elementos con clases específicas de Instagram
-                    username_elements = element.find_all(['span', 'a'], class_=re.compile(r'_ap3a|_aaco'))
+                    username_elements = [
+                        node for node in element.css('span, a')
+                        if _USERNAME_CLASS_RE.search(node.attributes.get('class') or '')
+                    ]
                     if username_elements:
                         for elem in username_elements:
-                            potential_username = elem.get_text(strip=True)
+                            potential_username = elem.text(deep=True, separator='', strip=True)
                             if potential_username and not potential_username.startswith('#'):
                                 username = potential_username.replace('@', '')
                                 break
@@ -893,7 +1216,7 @@ class InstagramScraper:
             comment_text = ''
             
             # Estrategia 1: Texto completo del elemento
-            full_text = element.get_text(strip=True)
+            full_text = element.text(deep=True, separator='', strip=True)
             if full_text:
                 # Eliminar el username del texto si está al principio
                 if full_text.startswith(username):
@@ -905,42 +1228,49 @@ class InstagramScraper:
             
             # Estrategia 2: Buscar en spans específicos
             if not comment_text and user_link:
-                text_elements = user_link.find_next_siblings(['span', 'div'])
+                text_elements = []
+                sibling = user_link.next
+                while sibling is not None:
+                    if sibling.tag in ('span', 'div'):
+                        text_elements.append(sibling)
+                    sibling = sibling.next
                 if text_elements:
-                    comment_text = ' '.join([elem.get_text(strip=True) for elem in text_elements[:3] if elem.get_text(strip=True)])
+                    sibling_texts = [elem.text(deep=True, separator='', strip=True) for elem in text_elements[:3]]
+                    comment_text = ' '.join([text for text in sibling_texts if text])
             
             # Estrategia 3: Buscar texto después del username
             if not comment_text:
-                text_parts = []
-                for text_node in element.find_all(text=True):
-                    text = text_node.strip()
-                    if text and text != username and not text.startswith('@'):
-                        text_parts.append(text)
+                # Un solo recorrido en C: cada nodo de texto ya recortado, separado por \x01
+                parts = element.text(deep=True, separator='\x01', strip=True).split('\x01')
+                text_parts = [text for text in parts if text and text != username and not text.startswith('@')]
                 comment_text = ' '.join(text_parts[:5])  # Limitar para evitar texto excesivo
             
             # Extraer tiempo (Instagram usa "time" elements)
-            time_element = element.find('time')
-            time_posted = time_element.get('datetime', '') if time_element else 'N/A'
+            time_element = element.css_first('time')
+            time_posted = (time_element.attributes.get('datetime') or '') if time_element else 'N/A'
             if time_posted and time_posted != 'N/A':
                 try:
-                    time_posted = datetime.fromisoformat(time_posted.replace('Z', '+00:00')).strftime('%d-%m-%Y')
+                    time_posted = self._iso_to_ddmmyyyy(time_posted)
                 except:
-                    time_posted = time_element.get_text(strip=True)
+                    time_posted = time_element.text(deep=True, separator='', strip=True)
             
             # Extraer likes (Instagram no siempre muestra likes de comentarios)
             likes = 0
-            like_elements = element.find_all(text=re.compile(r'\d+\s*(like|me gusta)', re.I))
+            like_elements = [text for text in self._text_nodes(element) if _COMMENT_LIKES_RE.search(text)]
             if like_elements:
-                like_match = re.search(r'(\d+)', like_elements[0])
+                like_match = _NUMBER_RE.search(like_elements[0])
                 if like_match:
                     likes = int(like_match.group(1))
             
             # Buscar imagen de perfil
-            profile_img = element.find('img')
-            profile_pic = profile_img.get('src', '') if profile_img else ''
+            profile_img = element.css_first('img')
+            profile_pic = (profile_img.attributes.get('src') or '') if profile_img else ''
             
             # Determinar si es respuesta (Instagram anida las respuestas)
-            is_reply = bool(element.find_parent('li')) and bool(element.find_parent('ul').find_parent('li'))
+            parent_ul = self._find_ancestor(element, 'ul')
+            is_reply = (self._find_ancestor(element, 'li') is not None and
+                        parent_ul is not None and
+                        self._find_ancestor(parent_ul, 'li') is not None)
             
             if username and comment_text:
                 return {
@@ -1031,23 +1361,21 @@ class InstagramScraper:
         comments = []
         
         try:
-            # Buscar en window.__additionalDataLoaded
-            json_patterns = [
-                r'window\\.__additionalDataLoaded\\([^)]+,\\s*({.+?})\\)',
-                r'window\\._sharedData\\s*=\\s*({.+?});',
-                r'"edge_media_to_comment"\\s*:\\s*({.+?"edges"\\s*:\\s*\\[.+?\\]})',
-                r'"comment_count"\\s*:\\s*(\\d+)',
-                r'"comments"\\s*:\\s*(\\[.+?\\])'
-            ]
+            # Una sola pasada para ubicar dónde puede empezar cada tipo de bloque
+            starts = {literal: [] for literal, _ in _EMBEDDED_COMMENTS_RES}
+            for start in _EMBEDDED_COMMENTS_START_RE.finditer(html):
+                starts[start.group()].append(start.start())
             
-            for pattern in json_patterns:
-                matches = re.findall(pattern, html, re.DOTALL)
+            # Buscar en window.__additionalDataLoaded
+            for literal, pattern in _EMBEDDED_COMMENTS_RES:
+                # Solo procesar los primeros 3 matches
+                matches = self._match_at_starts(pattern, html, starts[literal], limit=3)
                 if matches:
-                    print(f"Encontrado patrón JSON: {pattern[:30]}...")
-                    for match in matches[:3]:  # Solo procesar los primeros 3 matches
+                    print(f"Encontrado patrón JSON: {pattern.pattern[:30]}...")
+                    for match in matches:
                         try:
                             if isinstance(match, str) and match.startswith('{'):
-                                data = json.loads(match)
+                                data = orjson.loads(match)
                                 extracted = self._parse_json_comments(data)
                                 if extracted:
                                     comments.extend(extracted)
@@ -1059,6 +1387,25 @@ class InstagramScraper:
         
         return comments[:self.limits['max_comments_per_video']]
     
+    def _match_at_starts(self, pattern, html, starts, limit):
+        """
+        Devuelve el grupo 1 de hasta limit coincidencias de pattern, sin solaparse y
+        ancladas en las posiciones starts (ascendentes): las mismas que daría
+        pattern.findall(html)[:limit]
+        """
+        matches = []
+        end = -1
+        for start in starts:
+            if start < end:
+                continue
+            match = pattern.match(html, start)
+            if match:
+                matches.append(match.group(1))
+                if len(matches) == limit:
+                    break
+                end = match.end()
+        return matches
+    
     def _parse_json_comments(self, data):
         """Parsea comentarios desde datos JSON"""
         comments = []
@@ -1101,7 +1448,7 @@ class InstagramScraper:
         description = metadata.get('description', '')
         
         # Si hay descripción, extraer posibles menciones como "comentarios"
-        mentions = re.findall(r'@(\\w+)', description) if description else []
+        mentions = _MENTION_NAME_RE.findall(description) if description else []
         
         # Crear comentarios basados en la información disponible
         if comments_count > 0:
@@ -1110,24 +1457,11 @@ class InstagramScraper:
             
             print(f"Generando {num_comments} comentarios basados en metadata (total reclamado: {comments_count})")
             
-            # Plantillas de comentarios más realistas y variadas
-            comment_templates = [
-                "Amazing content! 🔥",
-                "Love this! 💪",
-                "Incredible skills! 🏁",
-                "Great job! 👏",
-                "This is awesome! ⭐",
-                "Fantastic work! 🚗",
-                "So cool! 😍",
-                "Wow! 🤩",
-                "Perfect! 👌",
-                "Excellent! 💯",
-                "Outstanding! 🏆",
-                "Impressive! 💥",
-                "Brilliant! ✨",
-                "Spectacular! 🎯",
-                "Phenomenal! 🚀"
-            ]
+            # Likes y respuestas aleatorios sorteados de una vez: más likes para los
+            # primeros 10 comentarios y respuestas solo en los primeros 5
+            likes = (random.choices(range(21), k=min(num_comments, 10))
+                     + random.choices(range(6), k=max(0, num_comments - 10)))
+            replies = random.choices(range(4), k=min(num_comments, 5))
             
             for i in range(num_comments):
                 # Usar menciones reales si están disponibles, sino generar usernames únicos
@@ -1136,9 +1470,8 @@ class InstagramScraper:
                     text = f"Great content! Thanks for sharing @{publisher}"
                 else:
                     username = f"user_{str(i+1).zfill(3)}"  # user_001, user_002, etc.
-                    # Usar diferentes plantillas de comentarios
-                    base_text = comment_templates[i % len(comment_templates)]
-                    text = base_text.replace('🔥', '').replace('💪', '').replace('🏁', '').replace('👏', '').replace('⭐', '').replace('🚗', '').replace('😍', '').replace('🤩', '').replace('👌', '').replace('💯', '').replace('🏆', '').replace('💥', '').replace('✨', '').replace('🎯', '').replace('🚀', '').strip()
+                    # Usar diferentes plantillas de comentarios (ya sin emoji)
+                    text = _COMMENT_TEMPLATE_TEXTS[i % len(_COMMENT_TEMPLATE_TEXTS)]
                     if not text:
                         text = f"Great post! #{i+1}"
                 
@@ -1149,12 +1482,12 @@ class InstagramScraper:
                     'user_url': f'https://www.instagram.com/{username}/',
                     'text': text,
                     'time': 'N/A',
-                    'likes': random.randint(0, 20) if i < 10 else random.randint(0, 5),  # Más likes para primeros comentarios
+                    'likes': likes[i],
                     'profile_pic': '',
                     'followers': 'N/A',
                     'is_reply': False,
                     'replied_to': '',
-                    'num_replies': random.randint(0, 3) if i < 5 else 0  # Algunos comentarios tienen respuestas
+                    'num_replies': replies[i] if i < 5 else 0  # Algunos comentarios tienen respuestas
                 }
                 comments.append(comment)
         
@@ -1220,68 +1553,114 @@ class InstagramScraper:
         
         # Agrupar comentarios por usuario
         for comment in comments:
-            username = comment['username'].replace('@', '')
+            username = comment['username'].lstrip('@').lower()
             if username not in unique_users:
                 unique_users[username] = []
             unique_users[username].append(comment)
         
-        # Obtener seguidores para cada usuario único
+        # Consultar en un solo lote los perfiles que no están en caché
+        pending = [username for username in unique_users if self._cached_followers(username) is None]
+        failed = []
+        if pending:
+            print(f"  Obteniendo seguidores para {len(pending)} usuarios en paralelo...")
+            configs = [self._follower_scrape_config(username) for username in pending]
+            results = self.scrapfly.scrape_concurrently(
+                configs, concurrency=_FOLLOWER_CONCURRENCY, delay=_FOLLOWER_DELAY
+            )
+            
+            for username, result in zip(pending, results):
+                if result['success']:
+                    self._store_followers(username, self._parse_followers_html(result['data']))
+                else:
+                    failed.append(username)
+        
+        # Solo los perfiles que fallaron en el lote se reintentan por separado (con
+        # reintentos de scrape_with_retry), con el mismo límite y pausa que el lote
+        retried = {}
+        if failed:
+            print(f"  Reintentando seguidores para {len(failed)} usuarios...")
+            with ThreadPoolExecutor(max_workers=_FOLLOWER_CONCURRENCY) as executor:
+                retried = dict(zip(failed, executor.map(self._retry_followers, failed)))
+        
         for username, user_comments in unique_users.items():
-            try:
-                print(f"  Obteniendo seguidores para @{username}...")
-                followers = self._get_user_followers(username)
-                
-                # Actualizar todos los comentarios de este usuario
-                for comment in user_comments:
-                    comment['followers'] = followers
-                
-                # Delay más largo para Instagram (más estricto)
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                print(f"  WARNING: Error obteniendo seguidores para @{username}: {str(e)}")
-                for comment in user_comments:
-                    comment['followers'] = 'N/A'
+            if username in retried:
+                followers = retried[username]
+            else:
+                followers = self._cached_followers(username) or 'N/A'
+            
+            # Actualizar todos los comentarios de este usuario
+            for comment in user_comments:
+                comment['followers'] = followers
         
         return comments
     
+    def _retry_followers(self, username):
+        """
+        Vuelve a consultar los seguidores de un usuario que falló en el lote
+        
+        Hace una pausa de _FOLLOWER_DELAY segundos tras la consulta, como el lote,
+        antes de dejar el hilo libre para el siguiente perfil.
+        
+        Returns:
+            str: Seguidores formateados, o 'N/A' si falla
+        """
+        try:
+            return self._get_user_followers(username)
+        except Exception as e:
+            print(f"  WARNING: Error obteniendo seguidores para @{username}: {str(e)}")
+            return 'N/A'
+        finally:
+            time.sleep(random.uniform(*_FOLLOWER_DELAY))
+    
+    def _cached_followers(self, username):
+        """
+        Devuelve los seguidores guardados en caché para un usuario
+        
+        Busca primero en memoria y luego en disco (PageCache), donde los conteos
+        se conservan _FOLLOWER_STORE_TTL segundos entre ejecuciones. Los valores
+        'N/A' solo se guardan en memoria y caducan tras _FOLLOWER_MISS_TTL segundos
+        para reintentar perfiles que fallaron de forma transitoria.
+        
+        Returns:
+            str: Seguidores formateados, o None si no hay entrada válida
+        """
+        username = username.lstrip('@').lower()
+        cached = self._follower_cache.get(username)
+        if cached:
+            followers, fetched_at = cached
+            if followers != 'N/A' or time.time() - fetched_at < _FOLLOWER_MISS_TTL:
+                return followers
+        
+        followers = self.page_cache.get(self.page_cache.make_key('followers', username), ttl=_FOLLOWER_STORE_TTL)
+        if followers is not None:
+            self._follower_cache[username] = (followers, time.time())
+        return followers
+    
+    def _store_followers(self, username, followers):
+        """Guarda los seguidores de un usuario en memoria y, si se encontraron, en disco"""
+        username = username.lstrip('@').lower()
+        self._follower_cache[username] = (followers, time.time())
+        if followers != 'N/A':
+            self.page_cache.set(self.page_cache.make_key('followers', username), followers)
+    
     def _get_user_followers(self, username):
-        """Obtiene el número de seguidores de un usuario"""
+        """Obtiene el número de seguidores de un usuario, usando la caché si es posible"""
+        followers = self._cached_followers(username)
+        if followers is not None:
+            return followers
+        
+        followers = self._fetch_user_followers(username)
+        self._store_followers(username, followers)
+        return followers
+    
+    def _fetch_user_followers(self, username):
+        """Consulta el perfil del usuario y extrae su número de seguidores"""
         try:
-            user_url = f"https://www.instagram.com/{username}/"
-            
-            config = self.scrapfly.create_scrape_config(user_url, 'instagram', {
-                'render_js': False,  # Intentar sin JS primero
-                'timeout': 15000
-            })
-            
+            config = self._follower_scrape_config(username)
             result = self.scrapfly.scrape_with_retry(config, max_retries=2)
             
             if result['success']:
-                html = result['data']
-                
-                # Buscar en JSON estructurado
-                follower_patterns = [
-                    r'"edge_followed_by":\s*{\s*"count":\s*(\d+)',
-                    r'"follower_count":(\d+)',
-                    r'"followers":(\d+)',
-                    r'(\d+)\s*followers'
-                ]
-                
-                for pattern in follower_patterns:
-                    match = re.search(pattern, html, re.IGNORECASE)
-                    if match:
-                        return self._format_number(int(match.group(1)))
-                
-                # Buscar en meta tags
-                soup = BeautifulSoup(html, 'html.parser')
-                meta_description = soup.find('meta', {'name': 'description'})
-                if meta_description:
-                    content = meta_description.get('content', '')
-                    follower_match = re.search(r'(\d+(?:,\d+)*)\s*followers', content, re.IGNORECASE)
-                    if follower_match:
-                        number_str = follower_match.group(1).replace(',', '')
-                        return self._format_number(int(number_str))
+                return self._parse_followers_html(result['data'])
                 
             return 'N/A'
             
@@ -1289,27 +1668,110 @@ class InstagramScraper:
             print(f"    WARNING: Error: {str(e)}")
             return 'N/A'
     
+    def _follower_scrape_config(self, username):
+        """Configuración de ScrapFly para descargar la página de perfil de un usuario"""
+        user_url = f"https://www.instagram.com/{username}/"
+        
+        # La página de perfil es de solo lectura: se usa la caché de ScrapFly para no
+        # repetir la descarga entre ejecuciones (la caché no admite 'session')
+        return self.scrapfly.create_scrape_config(user_url, 'instagram', {
+            'render_js': False,  # Intentar sin JS primero
+            'timeout': 15000,
+            'cache': True,
+            'cache_ttl': _PROFILE_HTTP_CACHE_TTL,
+            'session': None
+        })
+    
+    def _parse_followers_html(self, html):
+        """
+        Extrae el número de seguidores de la página de perfil
+        
+        Returns:
+            str: Seguidores formateados (p. ej. '1.2K'), o 'N/A' si no se encuentran
+        """
+        try:
+            # Leer el conteo directamente de los bloques JSON embebidos
+            followers = self._find_followers_in_json(html)
+            if followers is not None:
+                return self._format_number(followers)
+            
+            # Buscar en JSON estructurado, en una sola pasada sobre el HTML
+            match = self._best_follower_match(html)
+            if match:
+                return self._format_number(int(match.group(match.lastindex)))
+            
+            # Buscar en la meta description del <head>, sin parsear la página
+            content = self._find_meta_description(html)
+            if content:
+                follower_match = _META_FOLLOWERS_RE.search(content)
+                if follower_match:
+                    number_str = follower_match.group(1).replace(',', '')
+                    return self._format_number(int(number_str))
+            
+        except Exception as e:
+            print(f"    WARNING: Error: {str(e)}")
+        
+        return 'N/A'
+    
+    def _best_follower_match(self, html):
+        """
+        Recorre el HTML una sola vez y devuelve la coincidencia de _FOLLOWER_RE
+        con el patrón de mayor prioridad (menor número de grupo)
+        """
+        best = None
+        for match in _FOLLOWER_RE.finditer(html):
+            if best is None or match.lastindex < best.lastindex:
+                best = match
+                if best.lastindex == 1:
+                    break
+        return best
+    
+    def _find_followers_in_json(self, html):
+        """
+        Busca el conteo de seguidores en los bloques JSON embebidos del perfil
+        
+        Args:
+            html (str): HTML de la página de perfil
+            
+        Returns:
+            int: Número de seguidores, o None si no aparece en ningún bloque
+        """
+        # Empezar por los bloques más grandes, donde Instagram incluye los datos del usuario
+        payloads = sorted(_JSON_SCRIPT_RE.findall(html), key=len, reverse=True)
+        
+        for payload in payloads:
+            if 'edge_followed_by' not in payload and 'follower_count' not in payload:
+                continue
+            try:
+                stack = [orjson.loads(payload)]
+            except orjson.JSONDecodeError:
+                continue
+            
+            # Recorrido en profundidad sin recursión
+            while stack:
+                node = stack.pop()
+                if isinstance(node, dict):
+                    edge = node.get('edge_followed_by')
+                    if isinstance(edge, dict) and isinstance(edge.get('count'), int):
+                        return edge['count']
+                    if isinstance(node.get('follower_count'), int):
+                        return node['follower_count']
+                    stack.extend(node.values())
+                elif isinstance(node, list):
+                    stack.extend(node)
+        
+        return None
+    
     def _format_number(self, number):
         """Formatea números grandes"""
-        if number >= 1_000_000_000:
-            return f"{number/1_000_000_000:.1f}B"
-        elif number >= 1_000_000:
-            return f"{number/1_000_000:.1f}M"
-        elif number >= 1_000:
-            return f"{number/1_000:.1f}K"
-        else:
-            return str(number)
+        digits = str(number)
+        divisor, suffix = _NUMBER_SCALES[min(len(digits), len(_NUMBER_SCALES)) - 1]
+        return f"{number/divisor:.1f}{suffix}" if suffix else digits
     
     def get_post_id(self, url):
         """Extrae el ID del post de la URL"""
-        patterns = [
-            r'/p/([A-Za-z0-9_-]+)',
-            r'/reel/([A-Za-z0-9_-]+)',
-            r'/tv/([A-Za-z0-9_-]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _POST_ID_RES:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         
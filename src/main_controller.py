@@ -268,6 +268,12 @@ class SocialMediaController:
         except Exception as e:
             print(f"{Fore.RED}ERROR: Error inesperado: {str(e)}")
         finally:
+            for scraper in self.scrapers.values():
+                scraper.scrapfly.close()
+                # Solo los scrapers con caché de páginas tienen page_cache
+                page_cache = getattr(scraper, 'page_cache', None)
+                if page_cache is not None:
+                    page_cache.close()
             print(f"\n{Fore.CYAN}Gracias por usar Social Media Scraper!")
             input("Presiona Enter para salir...")
 
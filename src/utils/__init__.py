@@ -9,9 +9,11 @@ __author__ = "Social Media Scraper Team"
 from .url_validator import URLValidator
 from .file_handler import FileHandler
 from .scrapfly_config import ScrapFlyConfig
+from .page_cache import PageCache
 
 __all__ = [
     'URLValidator',
     'FileHandler', 
-    'ScrapFlyConfig'
+    'ScrapFlyConfig',
+    'PageCache'
 ]
\ No newline at end of file
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Caché en disco de páginas HTML descargadas, para no repetir solicitudes a ScrapFly
+
+También guarda resultados pequeños derivados de esas páginas (p. ej. seguidores de
+un perfil) bajo su propia clave y con su propio tiempo de validez.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Antigüedad máxima de cualquier fila: el mayor TTL que se usa al leer (los
+# seguidores de un perfil se conservan 7 días); las filas más viejas se borran
+_MAX_AGE = 7 * 24 * 3600
+
+class PageCache:
+    def __init__(self, ttl=6 * 3600, path=None, max_age=_MAX_AGE):
+        """
+        Args:
+            ttl (int): Segundos que una página guardada se considera válida
+            path (str): Ruta del archivo SQLite (por defecto cache/pages.sqlite en la raíz del proyecto)
+            max_age (int): Segundos tras los cuales una fila se borra al abrir la caché;
+                debe cubrir el mayor ttl pasado a get() por cualquier usuario del archivo
+        """
+        if path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            path = os.path.join(base_dir, 'cache', 'pages.sqlite')
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.ttl = ttl
+        self.path = path
+        # Varios hilos del scraper comparten la caché: una sola conexión, usada
+        # siempre bajo self.lock
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY, html TEXT NOT NULL, stored_at REAL NOT NULL)'
+        )
+        self.connection.commit()
+        self.purge_expired(max(max_age, ttl))
+
+    def purge_expired(self, max_age):
+        """Borra las filas guardadas hace más de max_age segundos (el TTL solo se comprueba al leer)"""
+        try:
+            with self.lock, self.connection:
+                self.connection.execute(
+                    'DELETE FROM pages WHERE stored_at < ?', (time.time() - max_age,)
+                )
+        except sqlite3.Error as e:
+            print(f"WARNING: Error limpiando caché de páginas: {str(e)}")
+
+    def make_key(self, *parts):
+        """Genera la clave SHA-256 de una solicitud (URL y, opcionalmente, el JavaScript ejecutado)"""
+        return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key, ttl=None):
+        """
+        Devuelve el HTML guardado para la clave, o None si no existe o caducó
+
+        Args:
+            key (str): Clave generada con make_key
+            ttl (int): Segundos de validez para esta lectura (por defecto self.ttl)
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    'SELECT html, stored_at FROM pages WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"WARNING: Error leyendo caché de páginas: {str(e)}")
+            return None
+
+        if row and time.time() - row[1] < ttl:
+            return row[0]
+        return None
+
+    def set(self, key, html):
+        """Guarda el HTML de una solicitud exitosa"""
+        try:
+            with self.lock, self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO pages (key, html, stored_at) VALUES (?, ?, ?)',
+                    (key, html, time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"WARNING: Error guardando caché de páginas: {str(e)}")
+
+    def close(self):
+        """Cierra la conexión con el archivo de caché"""
+        with self.lock:
+            self.connection.close()
@@ -6,6 +6,7 @@ Configuración y cliente para ScrapFly
 import os
 import time
 import random
+import asyncio
 from scrapfly import ScrapflyClient, ScrapeConfig
 from fake_useragent import UserAgent
 
@@ -16,6 +17,8 @@ class ScrapFlyConfig:
         
         if self.api_key:
             self.client = ScrapflyClient(key=self.api_key)
+            # Abrir una sola sesión HTTP (keep-alive) reutilizada por todas las peticiones
+            self.client.open()
         else:
             self.client = None
             
@@ -96,6 +99,11 @@ class ScrapFlyConfig:
         
         return api_key
     
+    def close(self):
+        """Cierra la sesión HTTP compartida del cliente ScrapFly"""
+        if self.client and self.client.http_session is not None:
+            self.client.close()
+    
     def verify_connection(self):
         """Verifica que la conexión con ScrapFly funcione"""
         if not self.client:
@@ -262,6 +270,56 @@ class ScrapFlyConfig:
             'data': None
         }
     
+    def scrape_concurrently(self, scrape_configs, concurrency=8, delay=None):
+        """
+        Ejecuta varias configuraciones de scraping en paralelo con el cliente asíncrono del SDK
+        
+        Args:
+            scrape_configs (list): Configuraciones ScrapeConfig a ejecutar
+            concurrency (int): Máximo de solicitudes simultáneas
+            delay (tuple): Pausa opcional (mínimo, máximo) en segundos tras cada
+                solicitud, antes de liberar su turno; limita el ritmo a unas
+                concurrency solicitudes por pausa
+            
+        Returns:
+            list: Un resultado por configuración, en el mismo orden y con el mismo
+                  formato que scrape_with_retry (sin reintentos)
+        """
+        if not self.client:
+            return [{'success': False, 'error': 'Cliente ScrapFly no disponible', 'data': None}
+                    for _ in scrape_configs]
+        
+        async def scrape_all():
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def scrape_one(scrape_config):
+                async with semaphore:
+                    try:
+                        result = await self.client.async_scrape(scrape_config)
+                    except Exception as e:
+                        return {'success': False, 'error': str(e), 'data': None}
+                    finally:
+                        if delay:
+                            await asyncio.sleep(random.uniform(*delay))
+                
+                if result.success:
+                    return {
+                        'success': True,
+                        'data': result.content,
+                        'status_code': getattr(result, 'status_code', 200),
+                        'url': getattr(result, 'url', scrape_config.url),
+                        'attempt': 1
+                    }
+                return {
+                    'success': False,
+                    'error': f"Status code: {getattr(result, 'status_code', 'Unknown')}",
+                    'data': None
+                }
+            
+            return await asyncio.gather(*(scrape_one(config) for config in scrape_configs))
+        
+        return asyncio.run(scrape_all())
+    
     def execute_javascript(self, url, javascript_code, platform='general'):
         """
         Ejecuta JavaScript personalizado en una página